@@ -1,16 +1,21 @@
 # Fixed app.py - Replace your current app.py with this
 
-from flask import render_template
+from flask import render_template, Response
 from app import create_app
+from app.metrics import registry
 import os
 
-app=create_app()
+app=create_app(os.getenv('APP_CONFIG', 'default'))
 
 
 @app.route('/health')
 def health_check():
     return {'status': 'healthy', 'message': 'AI Website Builder API is running'}
 
+@app.route('/metrics')
+def metrics():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
     return '''
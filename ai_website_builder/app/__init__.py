@@ -15,8 +15,54 @@ def create_app(config_name='default'):
     app = Flask(__name__, template_folder=template_dir)
     app.config.from_object(config[config_name])
 
-    # Initialize MongoDB
-    mongo.init_app(app)
+    # Queue-based logging with per-request correlation ids
+    from app.logging_config import configure_logging
+    configure_logging(app)
+
+    # Serialise ObjectId and datetime directly in jsonify
+    from app.json_provider import MongoJSONProvider
+    app.json = MongoJSONProvider(app)
+
+    # Initialize MongoDB, timing every command for /metrics
+    from app import metrics
+    mongo.init_app(app, event_listeners=[metrics.command_listener])
+    metrics.init_app(app)
+
+    # Rendered preview HTML cache
+    from app.services.preview_cache import preview_cache
+    preview_cache.init_app(app)
+
+    # Resolved principal cache used by require_auth
+    from app.services.principal_cache import principal_cache
+    principal_cache.init_app(app)
+    from app.services.role_version_cache import role_version_cache
+    role_version_cache.init_app(app)
+    from app.services.token_version_cache import token_version_cache
+    token_version_cache.init_app(app)
+
+    # Bounded bcrypt worker pool
+    from app.services.credential_service import CredentialService
+    CredentialService.init_app(app)
+
+    # Admin dashboard statistics snapshot
+    from app.services.stats_service import StatsService
+    StatsService.init_app(app)
+
+    # Generated content cache
+    from app.services.generation_cache import generation_cache
+    generation_cache.init_app(app)
+
+    # Shared Gemini client
+    from app.services import gemini_service
+    gemini_service.init_app(app)
+
+    # Background website generation workers
+    from app.services.job_service import JobService
+    JobService.init_app(app)
+
+    # Compile site templates once
+    from app.services.template_service import TemplateService
+    TemplateService.init_app(app)
 
     # Register Blueprints
     from app.auth import auth_bp
@@ -24,21 +70,17 @@ def create_app(config_name='default'):
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(api_bp, url_prefix='/api')
 
-    # Initialize database with default data
-    with app.app_context():
-        try:
-            # Test MongoDB connection
-            mongo.db.command('ping')
-            print("✅ MongoDB connected successfully!")
-            
-            # Create default roles and admin user
-            from app.models.role import Role
-            from app.models.user import User
-            Role.create_default_roles()
-            User.create_admin_user()
-            
-        except Exception as e:
-            print(f"❌ MongoDB error: {e}")
-            print("Please check your MongoDB URI in config.py or .env file")
+    # CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+
+    # Seeding on every boot is for local development; deployments run `flask init-db` once
+    if app.config.get('DB_BOOTSTRAP_ON_STARTUP'):
+        from app.cli import init_database
+        with app.app_context():
+            try:
+                init_database()
+            except Exception as e:
+                app.logger.error("MongoDB error: %s. Please check your MongoDB URI in config.py or .env file", e)
 
     return app
\ No newline at end of file
@@ -1,46 +1,54 @@
-from flask import request, jsonify
+import logging
+from bson.objectid import ObjectId
+from flask import request, jsonify, current_app
 from app.api import api_bp
 from app.middleware.auth_middleware import require_auth
 from app.middleware.permission_middleware import require_role
 from app.models.user import User
 from app.models.role import Role
-from app.models.website import Website
-from bson.objectid import ObjectId
+from app.services.stats_service import StatsService
+from app.services.rate_limiter import RateLimiter
+from app.services.principal_cache import principal_cache
+from app.api.pagination import encode_cursor, decode_cursor, parse_page_size, parse_bool
+from app.api.streaming import stream_json_list
 
-def serialize_object_id(obj):
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if isinstance(value, ObjectId):
-                obj[key]=str(value)
-            elif isinstance(value, dict):
-                serialize_object_id(value)
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        serialize_object_id(item)
-    return obj
+logger=logging.getLogger(__name__)
 
 @api_bp.route('/admin/users', methods=['GET'])
 @require_auth
 @require_role('admin')
 def get_all_users():
     try:
-        users=User.get_all_users()
-        for user in users:
-            user=serialize_object_id(user)
-            if user.get('role_id'):
-                role_data=Role.find_by_id(user['role_id'])
-                if role_data:
-                    role_data=serialize_object_id(role_data)
-                    user['role']=role_data['name']
-                else:
-                    user['role']='unknown'
-            else:
-                user['role']='no_role'
-            user.pop('password_hash', None)
-        return jsonify({'users': users}), 200
+        try:
+            limit=parse_page_size(request.args.get('limit'),
+                                current_app.config['DEFAULT_PAGE_SIZE'],
+                                current_app.config['MAX_PAGE_SIZE'])
+            is_active=parse_bool(request.args.get('is_active'))
+            cursor=request.args.get('cursor')
+            after=decode_cursor(cursor, (ObjectId,))[0] if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        role_id=None
+        role_name=request.args.get('role')
+        if role_name:
+            role_data=Role.find_by_name(role_name)
+            if not role_data:
+                return jsonify({'error': f'Role {role_name} not found'}), 404
+            role_id=role_data['_id']
+
+        users=User.list_with_roles(after, limit + 1, role_id, is_active,
+                                   batch_size=current_app.config['STREAM_BATCH_SIZE'])
+
+        def trailer(last, has_more):
+            return {
+                'total': User.count_users(role_id, is_active),
+                'limit': limit,
+                'next_cursor': encode_cursor([last['_id']]) if has_more else None}
+
+        return stream_json_list('users', users, limit=limit, trailer=trailer)
     except Exception as e:
-        print(f"Error in get_all_users: {str(e)}")
+        logger.exception("Error in get_all_users")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/users/<user_id>/role', methods=['PUT'])
@@ -61,7 +69,7 @@ def update_user_role(user_id):
         User.update_user_role(user_id, role_id)
         return jsonify({'message': 'User role updated successfully'}), 200
     except Exception as e:
-        print(f"Error in update_user_role: {str(e)}")
+        logger.exception("Error in update_user_role")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/users/<user_id>', methods=['DELETE'])
@@ -78,7 +86,7 @@ def delete_user(user_id):
         User.delete_user(user_id)
         return jsonify({'message': 'User deleted successfully'}), 200
     except Exception as e:
-        print(f"Error in delete_user: {str(e)}")
+        logger.exception("Error in delete_user")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/roles', methods=['GET'])
@@ -87,11 +95,9 @@ def delete_user(user_id):
 def get_all_roles():
     try:
         roles=Role.get_all_roles()
-        for role in roles:
-            role=serialize_object_id(role)
         return jsonify({'roles': roles}), 200
     except Exception as e:
-        print(f"Error in get_all_roles: {str(e)}")
+        logger.exception("Error in get_all_roles")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/roles', methods=['POST'])
@@ -113,7 +119,7 @@ def create_role():
             'role_id': role_id
         }), 201
     except Exception as e:
-        print(f"Error in create_role: {str(e)}")
+        logger.exception("Error in create_role")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/roles/<role_id>', methods=['PUT'])
@@ -138,7 +144,7 @@ def update_role(role_id):
         else:
             return jsonify({'error': 'No valid fields to update'}), 400
     except Exception as e:
-        print(f"Error in update_role: {str(e)}")
+        logger.exception("Error in update_role")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/roles/<role_id>', methods=['DELETE'])
@@ -154,7 +160,7 @@ def delete_role(role_id):
         Role.delete_role(role_id)
         return jsonify({'message': 'Role deleted successfully'}), 200
     except Exception as e:
-        print(f"Error in delete_role: {str(e)}")
+        logger.exception("Error in delete_role")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/admin/dashboard', methods=['GET'])
@@ -162,18 +168,30 @@ def delete_role(role_id):
 @require_role('admin')
 def admin_dashboard():
     try:
-        total_users=len(User.get_all_users())
-        total_websites=len(Website.get_all_websites())
-        published_websites=len(Website.get_published_websites())
-        total_roles=len(Role.get_all_roles())
         return jsonify({
-            'statistics': {
-                'total_users': total_users,
-                'total_websites': total_websites,
-                'published_websites': published_websites,
-                'total_roles': total_roles
-            }
+            'statistics': StatsService.get_dashboard_statistics()
         }), 200
     except Exception as e:
-        print(f"Error in admin_dashboard: {str(e)}")
+        logger.exception("Error in admin_dashboard")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/admin/cache-stats', methods=['GET'])
+@require_auth
+@require_role('admin')
+def cache_stats():
+    try:
+        return jsonify({'principal_cache': principal_cache.stats()}), 200
+    except Exception as e:
+        logger.exception("Error in cache_stats")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/admin/rate-limits', methods=['GET'])
+@require_auth
+@require_role('admin')
+def get_rate_limits():
+    try:
+        buckets=RateLimiter.get_buckets(request.args.get('prefix'))
+        return jsonify({'buckets': buckets}), 200
+    except Exception as e:
+        logger.exception("Error in get_rate_limits")
         return jsonify({'error': str(e)}), 500
@@ -1,28 +1,72 @@
-from flask import request, jsonify
+import logging
+from flask import request, jsonify, url_for, current_app, Response, stream_with_context
 from app.api import api_bp
 from app.middleware.auth_middleware import require_auth
 from app.middleware.permission_middleware import require_permission
-from app.services.gemini_service import GeminiService
+from app.middleware.rate_limit_middleware import require_rate_limit
+from app.services.gemini_service import get_gemini_service
+from app.services.fallback_content import get_fallback_content
+from app.services.content_parser import SECTIONS
 from app.models.website import Website
+from app.models.generation_job import GenerationJob
+from app.services.job_service import JobService, QueueFull
 from bson.objectid import ObjectId
+from concurrent.futures import ThreadPoolExecutor
 
-def serialize_object_id(obj):
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if isinstance(value, ObjectId):
-                obj[key]=str(value)
-            elif isinstance(value, dict):
-                serialize_object_id(value)
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        serialize_object_id(item)
-    return obj
+logger=logging.getLogger(__name__)
 
 @api_bp.route('/generate-website', methods=['POST'])
 @require_auth
 @require_permission('create_website')
+@require_rate_limit('generation')
 def generate_website():
+    try:
+        data=request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        required_fields=['business_type', 'industry']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'error': f'{field} is required'}), 400
+        
+        params={
+            'business_type': data['business_type'],
+            'industry': data['industry'],
+            'company_name': data.get('company_name', 'Your Company')}
+        
+        current_user_id=request.current_user['_id']
+        
+        try:
+            job_id=JobService.submit(current_user_id, params)
+        except QueueFull as e:
+            response=jsonify({'error': str(e)})
+            response.headers['Retry-After']='5'
+            return response, 503
+        
+        status_url=url_for('api.get_generation_job', job_id=job_id)
+        response=jsonify({
+            'message': 'Website generation queued',
+            'job_id': job_id,
+            'status': GenerationJob.QUEUED,
+            'status_url': status_url
+        })
+        response.headers['Location']=status_url
+        return response, 202
+        
+    except Exception as e:
+        logger.exception("Error in generate_website")
+        return jsonify({'error': str(e)}), 500
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {current_app.json.dumps(data)}\n\n"
+
+@api_bp.route('/generate-website/stream', methods=['POST'])
+@require_auth
+@require_permission('create_website')
+@require_rate_limit('generation')
+def generate_website_stream():
     try:
         data=request.get_json()
         
@@ -37,68 +81,193 @@ def generate_website():
         business_type=data['business_type']
         industry=data['industry']
         company_name=data.get('company_name', 'Your Company')
-        
         current_user_id=request.current_user['_id']
+        gemini_service=get_gemini_service()
+        
+        def generate():
+            content={'services': []}
+            try:
+                for section, value in gemini_service.stream_website_sections(
+                        business_type, industry, company_name):
+                    if section == 'service':
+                        content['services'].append(value)
+                        yield format_sse('service', {'index': len(content['services']) - 1, 'service': value})
+                    else:
+                        content[section]=value
+                        yield format_sse(section, value)
+            except Exception as ai_error:
+                logger.warning("AI streaming failed: %s", ai_error)
+            
+            # Fill in whatever the model did not deliver or got wrong, like parse_website_content's missing list
+            fallback=gemini_service.get_fallback_content(business_type, industry, company_name)
+            fallback_sections=[]
+            for section in ('hero', 'about', 'contact'):
+                if section not in content:
+                    content[section]=fallback[section]
+                    fallback_sections.append(section)
+                    yield format_sse(section, content[section])
+            if not content['services']:
+                fallback_sections.append('services')
+                for index, service in enumerate(fallback['services']):
+                    content['services'].append(service)
+                    yield format_sse('service', {'index': index, 'service': service})
+            content={key: content[key] for key in SECTIONS}
+            if fallback_sections:
+                logger.warning("Using fallback content for %s", ', '.join(fallback_sections))
+            
+            try:
+                website=Website(
+                    title=f"{company_name} - {business_type}",
+                    content=content,
+                    owner_id=current_user_id,
+                    business_type=business_type,
+                    industry=industry,
+                    template_id='default')
+                website_id=website.save()
+                yield format_sse('done', {'website_id': website_id, 'content': content,
+                                          'fallback_sections': fallback_sections})
+            except Exception as e:
+                logger.exception("Error saving streamed website")
+                yield format_sse('error', {'error': str(e)})
+        
+        return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+    except Exception as e:
+        logger.exception("Error in generate_website_stream")
+        return jsonify({'error': str(e)}), 500
+
+def batch_size():
+    data=request.get_json(silent=True)
+    specs=data.get('websites') if isinstance(data, dict) else None
+    return len(specs) if isinstance(specs, list) and specs else 1
+
+@api_bp.route('/generate-websites/batch', methods=['POST'])
+@require_auth
+@require_permission('create_website')
+@require_rate_limit('batch_generation', cost=batch_size, global_scope='generation')
+def generate_websites_batch():
+    try:
+        data=request.get_json()
+        specs=data.get('websites') if isinstance(data, dict) else None
+        if not isinstance(specs, list) or not specs:
+            return jsonify({'error': 'websites must be a non-empty list'}), 400
+        
+        max_items=current_app.config['BATCH_GENERATION_MAX_ITEMS']
+        if len(specs) > max_items:
+            return jsonify({'error': f'At most {max_items} websites per batch'}), 400
+        
+        results=[None] * len(specs)
+        valid=[]
+        for index, spec in enumerate(specs):
+            missing=[field for field in ('business_type', 'industry')
+                    if not isinstance(spec, dict) or not spec.get(field)]
+            if missing:
+                results[index]={'index': index, 'status': 'invalid',
+                                'error': f"{', '.join(missing)} required"}
+            else:
+                valid.append((index, spec['business_type'], spec['industry'],
+                            spec.get('company_name', 'Your Company')))
+        
+        app=current_app._get_current_object()
+        gemini_service=get_gemini_service()
+        
+        def generate(item):
+            index, business_type, industry, company_name=item
+            with app.app_context():
+                return gemini_service.generate_with_fallbacks(business_type, industry, company_name)
+        
+        # Wall time tracks the slowest generation instead of the sum
+        concurrency=min(current_app.config['BATCH_GENERATION_CONCURRENCY'], len(valid)) or 1
+        websites=[]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures=[executor.submit(generate, item) for item in valid]
+            for (index, business_type, industry, company_name), future in zip(valid, futures):
+                try:
+                    content, fallback_sections=future.result()
+                except Exception as ai_error:
+                    # Same as single-site generation: an upstream failure falls back to default content
+                    logger.warning("Batch generation failed for item %d: %s", index, ai_error)
+                    try:
+                        content=get_fallback_content(business_type, industry, company_name)
+                    except Exception as e:
+                        logger.exception("Fallback content failed for batch item %d", index)
+                        results[index]={'index': index, 'status': 'failed', 'error': str(e)}
+                        continue
+                    fallback_sections=list(SECTIONS)
+                websites.append((index, fallback_sections, Website(
+                    title=f"{company_name} - {business_type}",
+                    content=content,
+                    owner_id=request.current_user['_id'],
+                    business_type=business_type,
+                    industry=industry,
+                    template_id='default')))
+        
+        website_ids=Website.insert_many([website for _, _, website in websites])
+        for (index, fallback_sections, _), website_id in zip(websites, website_ids):
+            results[index]={'index': index, 'status': 'created', 'website_id': website_id}
+            if fallback_sections:
+                # Saved, but some sections are generic fallback copy rather than generated
+                results[index].update(status='degraded', fallback_sections=fallback_sections)
+        
+        created=len(website_ids)
+        if created:
+            status_code=201
+        elif valid:
+            # Valid items that could not be created are a server-side failure, not a bad request
+            status_code=503
+        else:
+            status_code=400
+        return jsonify({
+            'message': f'Generated {created} of {len(specs)} websites',
+            'created': created,
+            'results': results
+        }), status_code
+        
+    except Exception as e:
+        logger.exception("Error in generate_websites_batch")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/generation-jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_generation_job(job_id):
+    try:
+        if not ObjectId.is_valid(job_id):
+            return jsonify({'error': 'Invalid job ID format'}), 400
+        
+        job=GenerationJob.find_by_id(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        user_role=request.current_user.get('role') or {}
+        if (user_role.get('name') != 'admin' and
+            str(job['owner_id']) != str(request.current_user['_id'])):
+            return jsonify({'error': 'Access denied'}), 403
         
         try:
-            gemini_service=GeminiService()
-            website_content=gemini_service.generate_website_content(
-                business_type, industry, company_name)
-        except Exception as ai_error:
-            print(f"AI generation failed: {ai_error}")
-            website_content={
-                "hero": {
-                    "title": f"Welcome to {company_name}",
-                    "subtitle": f"Your trusted partner in {industry}",
-                    "cta_text": "Get Started"
-                },
-                "about": {
-                    "title": "About Us",
-                    "content": f"We are a leading {business_type} company specializing in {industry}. Our team is dedicated to providing excellent service and innovative solutions."
-                },
-                "services": [
-                    {
-                        "title": "Professional Service",
-                        "description": f"Expert {business_type} services tailored to your needs."
-                    },
-                    {
-                        "title": "Quality Solutions",
-                        "description": "High-quality solutions designed to meet your requirements."
-                    },
-                    {
-                        "title": "Customer Support",
-                        "description": "Dedicated support to ensure your success."
-                    }
-                ],
-                "contact": {
-                    "title": "Get In Touch",
-                    "content": "Contact us today to learn how we can help your business grow."
-                }
-            }
-        
-        website=Website(
-            title=f"{company_name} - {business_type}",
-            content=website_content,
-            owner_id=current_user_id,
-            business_type=business_type,
-            industry=industry,
-            template_id='default')
-        
-        website_id=website.save()
+            wait=min(float(request.args.get('wait', 0)), current_app.config['GENERATION_JOB_MAX_WAIT'])
+        except ValueError:
+            return jsonify({'error': 'wait must be a number of seconds'}), 400
+        if wait > 0 and job['status'] not in GenerationJob.FINISHED_STATUSES:
+            job=JobService.wait(job_id, wait)
         
         return jsonify({
-            'message': 'Website generated successfully',
-            'website_id': website_id,
-            'content': website_content
-        }), 201
+            'job_id': job_id,
+            'status': job['status'],
+            'website_id': str(job['website_id']) if job.get('website_id') else None,
+            'error': job.get('error'),
+            'created_at': job.get('created_at'),
+            'finished_at': job.get('finished_at')
+        }), 200
         
     except Exception as e:
-        print(f"Error in generate_website: {str(e)}")
+        logger.exception("Error in get_generation_job")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/regenerate-content/<website_id>', methods=['POST'])
 @require_auth
 @require_permission('update_website')
+@require_rate_limit('generation')
 def regenerate_content(website_id):
     try:
         website_data=Website.find_by_id(website_id)
@@ -113,43 +282,18 @@ def regenerate_content(website_id):
             return jsonify({'error': 'Access denied'}), 403
         
         try:
-            gemini_service=GeminiService()
+            gemini_service=get_gemini_service()
             new_content=gemini_service.generate_website_content(
                 website_data['business_type'],
                 website_data['industry'],
-                website_data['title'].split(' - ')[0] if ' - ' in website_data['title'] else website_data['title'])
+                website_data['title'].split(' - ')[0] if ' - ' in website_data['title'] else website_data['title'],
+                use_cache=False,
+                fallback_variant='refresh')
         except Exception as ai_error:
-            print(f"AI regeneration failed: {ai_error}")
+            logger.warning("AI regeneration failed: %s", ai_error)
             company_name=website_data['title'].split(' - ')[0] if ' - ' in website_data['title'] else website_data['title']
-            new_content={
-                "hero": {
-                    "title": f"Welcome to {company_name}",
-                    "subtitle": f"Refreshed content for your {website_data['business_type']} business",
-                    "cta_text": "Discover More"
-                },
-                "about": {
-                    "title": "About Our Company",
-                    "content": f"We continue to lead in {website_data['industry']} with innovative {website_data['business_type']} solutions. Our commitment to excellence drives everything we do."
-                },
-                "services": [
-                    {
-                        "title": "Premium Services",
-                        "description": f"Top-tier {website_data['business_type']} services for discerning clients."
-                    },
-                    {
-                        "title": "Innovation Focus", 
-                        "description": "Cutting-edge solutions that set industry standards."
-                    },
-                    {
-                        "title": "Expert Support",
-                        "description": "Professional guidance from industry experts."
-                    }
-                ],
-                "contact": {
-                    "title": "Connect With Us",
-                    "content": "Ready to experience the difference? Get in touch today."
-                }
-            }
+            new_content=get_fallback_content(
+                website_data['business_type'], website_data['industry'], company_name, variant='refresh')
         
         Website.update_website(website_id, {'content': new_content})
         
@@ -159,5 +303,5 @@ def regenerate_content(website_id):
         }), 200
         
     except Exception as e:
-        print(f"Error in regenerate_content: {str(e)}")
+        logger.exception("Error in regenerate_content")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,48 @@
+import base64
+import binascii
+from bson import json_util
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last returned document as an opaque token."""
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, types):
+    """Decode a cursor whose values must be instances of types, position by position."""
+    try:
+        values=json_util.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursor('Invalid pagination cursor') from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor('Invalid pagination cursor')
+    if not all(isinstance(value, value_type) for value, value_type in zip(values, types)):
+        raise InvalidCursor('Invalid pagination cursor')
+    return values
+
+
+def parse_page_size(value, default, maximum):
+    if value is None:
+        return default
+    try:
+        size=int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if size < 1:
+        raise ValueError('limit must be positive')
+    return min(size, maximum)
+
+
+def parse_bool(value):
+    if value is None:
+        return None
+    value=value.lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'Invalid boolean value: {value}')
@@ -0,0 +1,49 @@
+from flask import Response, current_app, stream_with_context
+
+_END=object()
+
+
+def stream_json_list(key, documents, limit=None, trailer=None, batch_size=None):
+    """Respond with ``{"<key>": [...], ...trailer}`` encoded while the cursor is iterated.
+
+    Documents are encoded and sent ``batch_size`` at a time, so memory stays
+    flat however long the listing is. With ``limit``, ``documents`` may yield
+    one extra document that is not sent and only marks that more exist.
+    ``trailer(last_document, has_more)`` returns the fields written after the
+    array, such as ``next_cursor`` and ``total``.
+
+    The first document is fetched before the response starts so query errors
+    still surface to the caller as an exception rather than a cut-off body.
+    """
+    dumps=current_app.json.dumps
+    batch_size=batch_size or current_app.config.get('STREAM_BATCH_SIZE', 100)
+    documents=iter(documents)
+    first=next(documents, _END)
+
+    def generate():
+        chunk=['{', dumps(key), ':[']
+        last=None
+        has_more=False
+        count=0
+        document=first
+        while document is not _END:
+            if limit is not None and count == limit:
+                has_more=True
+                break
+            if count:
+                chunk.append(',')
+            chunk.append(dumps(document))
+            last=document
+            count+=1
+            if count % batch_size == 0:
+                yield ''.join(chunk)
+                chunk=[]
+            document=next(documents, _END)
+
+        chunk.append(']')
+        for name, value in (trailer(last, has_more) if trailer else {}).items():
+            chunk.append(f',{dumps(name)}:{dumps(value)}')
+        chunk.append('}\n')
+        yield ''.join(chunk)
+
+    return Response(stream_with_context(generate()), mimetype=current_app.json.mimetype)
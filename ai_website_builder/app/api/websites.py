@@ -1,27 +1,29 @@
-from flask import request, jsonify, render_template_string
+import logging
+from flask import request, jsonify, make_response, send_file, current_app
 from app.api import api_bp
 from app.middleware.auth_middleware import require_auth
 from app.middleware.permission_middleware import require_permission
 from app.models.website import Website
+from app.services.preview_cache import preview_cache, PreviewCache
+from app.services.template_service import TemplateService
+from app.services.static_site_service import StaticSiteService
+from app.api.pagination import encode_cursor, decode_cursor, parse_page_size
+from app.api.streaming import stream_json_list
 from bson.objectid import ObjectId
 from bson.errors import InvalidId
+from datetime import datetime
 
-def serialize_object_id(obj):
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if isinstance(value, ObjectId):
-                obj[key]=str(value)
-            elif isinstance(value, dict):
-                serialize_object_id(value)
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        serialize_object_id(item)
-    elif isinstance(obj, list):
-        for item in obj:
-            if isinstance(item, dict):
-                serialize_object_id(item)
-    return obj
+logger=logging.getLogger(__name__)
+
+def parse_fields(value):
+    """Parse the ?fields= projection list, rejecting unknown field names"""
+    if not value:
+        return None
+    fields=[field.strip() for field in value.split(',') if field.strip()]
+    unknown=[field for field in fields if field not in Website.LISTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
 
 def validate_object_id(obj_id):
     """Validate if string is a valid ObjectId"""
@@ -39,34 +41,46 @@ def get_websites():
         user_role=request.current_user.get('role', {})
         user_id=request.current_user['_id']
         
+        try:
+            limit=parse_page_size(request.args.get('limit'),
+                                current_app.config['DEFAULT_PAGE_SIZE'],
+                                current_app.config['MAX_PAGE_SIZE'])
+            cursor=request.args.get('cursor')
+            after=decode_cursor(cursor, (datetime, ObjectId)) if cursor else None
+            fields=parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        batch_size=current_app.config['STREAM_BATCH_SIZE']
         if user_role.get('name') == 'admin':
-            websites=Website.get_all_websites()
+            page=Website.list_page(after=after, limit=limit + 1, fields=fields, batch_size=batch_size)
         elif user_role.get('name') == 'viewer':
-            websites=Website.get_published_websites()
-            print(f"[DEBUG] Viewer {user_id} retrieved {len(websites)} published websites")
+            page=Website.list_page(published_only=True, after=after, limit=limit + 1, fields=fields,
+                                   batch_size=batch_size)
         else:
-            websites=Website.find_by_owner(user_id)
-        websites=serialize_object_id(websites)
+            page=Website.list_page(owner_id=user_id, after=after, limit=limit + 1, fields=fields,
+                                   batch_size=batch_size)
+        
+        def trailer(last, has_more):
+            next_cursor=None
+            if has_more:
+                next_cursor=encode_cursor([last['updated_at'], last['_id']])
+            return {'limit': limit, 'next_cursor': next_cursor}
         
-        print(f"[DEBUG] Retrieved {len(websites)} websites for user role: {user_role.get('name')}")
-        return jsonify({'websites': websites}), 200
+        return stream_json_list('websites', page, limit=limit, trailer=trailer)
         
     except Exception as e:
-        print(f"Error in get_websites: {str(e)}")
+        logger.exception("Error in get_websites")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/websites/published', methods=['GET'])
 def get_published_websites_public():
     try:
-        websites=Website.get_published_websites()
-        
-        websites=serialize_object_id(websites)
-        
-        print(f"[DEBUG] Retrieved {len(websites)} published websites for public access")
-        return jsonify({'websites': websites}), 200
+        websites=Website.get_published_websites(current_app.config['STREAM_BATCH_SIZE'])
+        return stream_json_list('websites', websites)
         
     except Exception as e:
-        print(f"Error in get_published_websites_public: {str(e)}")
+        logger.exception("Error in get_published_websites_public")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/websites/<website_id>', methods=['GET'])
@@ -95,12 +109,10 @@ def get_website(website_id):
             if website_owner_id != current_user_id:
                 return jsonify({'error': 'Access denied - not your website'}), 403
         
-        website_data=serialize_object_id(website_data)
-        
         return jsonify({'website': website_data}), 200
         
     except Exception as e:
-        print(f"Error in get_website: {str(e)}")
+        logger.exception("Error in get_website")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/websites/<website_id>', methods=['PUT'])
@@ -108,10 +120,10 @@ def get_website(website_id):
 @require_permission('update_website')
 def update_website(website_id):
     try:
-        print(f"[DEBUG] Updating website with ID: {website_id}")
+        logger.debug("Updating website %s", website_id)
         
         if not validate_object_id(website_id):
-            print(f"[ERROR] Invalid ObjectId format: {website_id}")
+            logger.info("Invalid website ID format: %s", website_id)
             return jsonify({
                 'error': 'Invalid website ID format',
                 'provided_id': website_id,
@@ -119,7 +131,7 @@ def update_website(website_id):
         
         website_data=Website.find_by_id(website_id)
         if not website_data:
-            print(f"[ERROR] Website not found in database: {website_id}")
+            logger.info("Website not found: %s", website_id)
             return jsonify({
                 'error': f'Website with ID {website_id} not found',
                 'provided_id': website_id,
@@ -129,7 +141,8 @@ def update_website(website_id):
         current_user_id=str(request.current_user['_id'])
         website_owner_id=str(website_data['owner_id'])
         
-        print(f"[DEBUG] User: {current_user_id}, Owner: {website_owner_id}, Role: {user_role.get('name')}")
+        logger.debug("User %s (role %s) updating website owned by %s",
+                     current_user_id, user_role.get('name'), website_owner_id)
         
         if user_role.get('name') == 'viewer':
             return jsonify({
@@ -144,7 +157,7 @@ def update_website(website_id):
         if not data:
             return jsonify({'error': 'No data provided in request body'}), 400
         
-        print(f"[DEBUG] Update data: {data}")
+        logger.debug("Update request fields: %s", list(data))
         
         update_data={}
         allowed_fields=['title', 'content', 'is_published', 'template_id']
@@ -160,25 +173,23 @@ def update_website(website_id):
                 'provided_fields': list(data.keys())
             }), 400
         
-        print(f"[DEBUG] Validated update data: {update_data}")
-        
         result=Website.update_website(website_id, update_data)
         
         if result.modified_count == 0:
-            print(f"[WARNING] No documents were modified for website ID: {website_id}")
+            logger.warning("No documents were modified for website %s", website_id)
             if not Website.find_by_id(website_id):
                 return jsonify({
                     'error': 'Website was deleted during the update process',
                     'website_id': website_id}), 404
         
-        print(f"[DEBUG] Website updated successfully: {website_id}")
+        logger.debug("Website %s updated: %s", website_id, list(update_data))
         return jsonify({
             'message': 'Website updated successfully',
             'website_id': website_id,
             'updated_fields': list(update_data.keys())}), 200
         
     except Exception as e:
-        print(f"Error in update_website: {str(e)}")
+        logger.exception("Error in update_website")
         return jsonify({
             'error': 'Internal server error during update',
             'details': str(e),
@@ -209,7 +220,7 @@ def delete_website(website_id):
         return jsonify({'message': 'Website deleted successfully'}), 200
         
     except Exception as e:
-        print(f"Error in delete_website: {str(e)}")
+        logger.exception("Error in delete_website")
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/preview/<website_id>')
@@ -218,6 +229,12 @@ def preview_website(website_id):
         if not validate_object_id(website_id):
             return "Invalid website ID format", 400
         
+        # Published sites are served straight from their static artifact
+        try:
+            return send_file(StaticSiteService.artifact_path(website_id), mimetype='text/html')
+        except FileNotFoundError:
+            pass
+        
         website_data=Website.find_by_id(website_id)
         if not website_data:
             return "Website not found", 404
@@ -225,90 +242,22 @@ def preview_website(website_id):
         if not website_data.get('is_published', False):
             return "Website not published", 403
         
-        content=website_data.get('content', {})
-        if isinstance(content, str):
-            return f"<html><body><h1>{website_data.get('title', 'Website')}</h1><div>{content}</div></body></html>"
-        
-        template="""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{{ title }}</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 0; padding: 0; line-height: 1.6; }
-                .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-                .hero { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 80px 0; text-align: center; }
-                .hero h1 { font-size: 3em; margin-bottom: 20px; }
-                .hero p { font-size: 1.2em; margin-bottom: 30px; }
-                .btn { background: #ff6b6b; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; }
-                .section { padding: 60px 0; }
-                .services { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 30px; margin-top: 30px; }
-                .service-card { background: #f8f9fa; padding: 30px; border-radius: 10px; text-align: center; }
-                .contact { background: #f8f9fa; }
-            </style>
-        </head>
-        <body>
-            <!-- Hero Section -->
-            <section class="hero">
-                <div class="container">
-                    <h1>{{ hero_title }}</h1>
-                    <p>{{ hero_subtitle }}</p>
-                    <a href="#contact" class="btn">{{ hero_cta }}</a>
-                </div>
-            </section>
-            
-            <!-- About Section -->
-            <section class="section">
-                <div class="container">
-                    <h2>{{ about_title }}</h2>
-                    <p>{{ about_content }}</p>
-                </div>
-            </section>
-            
-            <!-- Services Section -->
-            <section class="section">
-                <div class="container">
-                    <h2>Our Services</h2>
-                    <div class="services">
-                        {% for service in services %}
-                        <div class="service-card">
-                            <h3>{{ service.title }}</h3>
-                            <p>{{ service.description }}</p>
-                        </div>
-                        {% endfor %}
-                    </div>
-                </div>
-            </section>
-            
-            <!-- Contact Section -->
-            <section class="section contact" id="contact">
-                <div class="container">
-                    <h2>{{ contact_title }}</h2>
-                    <p>{{ contact_content }}</p>
-                </div>
-            </section>
-        </body>
-        </html>
-        """
-        
-        hero=content.get('hero', {})
-        about=content.get('about', {})
-        services=content.get('services', [])
-        contact=content.get('contact', {})
-        
-        return render_template_string(template, 
-                                    title=website_data.get('title', 'Website'),
-                                    hero_title=hero.get('title', 'Welcome'),
-                                    hero_subtitle=hero.get('subtitle', 'Professional website'),
-                                    hero_cta=hero.get('cta_text', 'Get Started'),
-                                    about_title=about.get('title', 'About Us'),
-                                    about_content=about.get('content', 'Learn more about our business.'),
-                                    services=services,
-                                    contact_title=contact.get('title', 'Contact Us'),
-                                    contact_content=contact.get('content', 'Get in touch with us today.'))
+        cache_key=PreviewCache.make_key(website_data)
+        etag=PreviewCache.make_etag(cache_key)
+        if request.if_none_match.contains(etag):
+            response=make_response('', 304)
+        else:
+            html=preview_cache.get(cache_key)
+            if html is None:
+                html=TemplateService.render_website(website_data)
+                preview_cache.set(cache_key, html)
+            response=make_response(html)
+        
+        response.set_etag(etag)
+        response.cache_control.public=True
+        response.cache_control.no_cache=True
+        return response
         
     except Exception as e:
-        print(f"Error in preview_website: {str(e)}")
-        return f"Error: {str(e)}", 500
\ No newline at end of file
+        logger.exception("Error in preview_website")
+        return f"Error: {str(e)}", 500
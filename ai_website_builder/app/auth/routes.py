@@ -3,6 +3,7 @@ from app.auth import auth_bp
 from app.models.user import User
 from app.models.role import Role
 from app.auth.utils import generate_token
+from pymongo.errors import DuplicateKeyError
 import re
 
 @auth_bp.route('/register', methods=['POST'])
@@ -25,9 +26,12 @@ def register():
             return jsonify({'error': 'Default role not found'}), 500
 
         user=User(data['email'], data['password'], viewer_role['_id'])
-        user_id=user.save()
+        try:
+            user_id=user.save()
+        except DuplicateKeyError:
+            return jsonify({'error': 'User already exists'}), 409
 
-        token=generate_token(user_id)
+        token=generate_token(user_id, viewer_role)
 
         return jsonify({
             'message': 'User registered successfully',
@@ -49,8 +53,7 @@ def login():
         if not user_data:
             return jsonify({'error': 'Invalid credentials'}), 401
 
-        user=User(user_data['email'], '')
-        user.password_hash=user_data['password_hash']
+        user=User.from_document(user_data)
 
         if not user.check_password(data['password']):
             return jsonify({'error': 'Invalid credentials'}), 401
@@ -58,10 +61,14 @@ def login():
         if not user_data.get('is_active', True):
             return jsonify({'error': 'Account is deactivated'}), 401
 
-        token=generate_token(str(user_data['_id']))
+        # Upgrade hashes made with an older work factor while we have the password
+        if user.needs_rehash():
+            User.update_password_hash(user_data['_id'], user.hash_password(data['password']))
 
         role_data=Role.find_by_id(user_data['role_id'])
 
+        token=generate_token(str(user_data['_id']), role_data)
+
         return jsonify({
             'message': 'Login successful',
             'token': token,
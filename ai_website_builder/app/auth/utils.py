@@ -1,16 +1,30 @@
 import jwt
+from bson.objectid import ObjectId
 from datetime import datetime, timedelta, timezone
 from flask import current_app
 from app.models.user import User
 from app.models.role import Role
+from app.models.permission import Permission
+from app.models.token_version import TokenVersion
+from app.services.principal_cache import principal_cache
+from app.services.role_version_cache import role_version_cache
+from app.services.token_version_cache import token_version_cache
 
-def generate_token(user_id):
+def generate_token(user_id, role_data=None):
     payload={
         'user_id': user_id,
         'exp': datetime.now(timezone.utc)
         + current_app.config['JWT_ACCESS_TOKEN_EXPIRES'],
         'iat': datetime.now(timezone.utc),
     }
+    if role_data and current_app.config.get('JWT_PERMISSION_CLAIMS'):
+        payload.update({
+            'role_id': str(role_data['_id']),
+            'role': role_data['name'],
+            'role_version': role_data.get('version', 0),
+            'user_version': TokenVersion.get(user_id),
+            'perms': Permission.to_mask(role_data.get('permissions', [])),
+        })
     return jwt.encode(payload, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
 
 def decode_token(token):
@@ -22,12 +36,38 @@ def decode_token(token):
     except jwt.InvalidTokenError:
         return None
 
+def get_user_from_claims(payload):
+    """Build the principal from permission claims, or None if the role or user changed since issue."""
+    if role_version_cache.get(payload['role_id']) != payload['role_version']:
+        return None
+    if not token_version_cache.is_current(payload['user_id'], payload.get('user_version', 0)):
+        return None
+    role_id=ObjectId(payload['role_id'])
+    return {
+        '_id': ObjectId(payload['user_id']),
+        'role_id': role_id,
+        # Tokens are only issued to active users, and anything that changes that bumps the user version
+        'is_active': True,
+        'role': {
+            '_id': role_id,
+            'name': payload['role'],
+            'permissions': Permission.from_mask(payload['perms']),
+            'permission_mask': payload['perms']}}
+
 def get_user_from_token(token):
     payload=decode_token(token)
     if payload:
+        if 'perms' in payload and current_app.config.get('JWT_PERMISSION_CLAIMS'):
+            return get_user_from_claims(payload)
+        user_data=principal_cache.get(payload['user_id'])
+        if user_data:
+            return user_data
         user_data=User.find_by_id(payload['user_id'])
         if user_data:
             role_data=Role.find_by_id(user_data['role_id'])
+            if role_data:
+                role_data['permission_mask']=Permission.to_mask(role_data.get('permissions', []))
             user_data['role']=role_data
+            principal_cache.set(payload['user_id'], user_data)
             return user_data
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,46 @@
+import click
+from app.models.role import Role
+from app.models.user import User
+from app.models.website import Website
+from app.models.indexes import ensure_indexes, find_collection_scans
+from app.services.static_site_service import StaticSiteService
+
+def init_database():
+    """Create indexes, default roles and the default admin; safe to run any number of times."""
+    return {
+        'indexes': ensure_indexes(),
+        'roles': Role.create_default_roles(),
+        'admin_created': User.create_admin_user()
+    }
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db():
+        """Create indexes, default roles and the admin user if they are missing."""
+        result=init_database()
+        for collection, names in result['indexes'].items():
+            click.echo(f"{collection}: {', '.join(names)}")
+        click.echo(f"Created roles: {', '.join(result['roles']) or 'none'}")
+        click.echo('Created admin user admin@admin.com' if result['admin_created'] else 'Admin user already exists')
+
+    @app.cli.command('publish-sites')
+    def publish_sites():
+        """Rebuild the static artifact of every published website."""
+        published, removed=StaticSiteService.rebuild_all(Website.get_published_websites())
+        click.echo(f"Published {published} website(s), removed {removed} stale artifact(s)")
+
+    @app.cli.command('ensure-indexes')
+    def ensure_indexes_command():
+        """Create the indexes declared on each model."""
+        for collection, names in ensure_indexes().items():
+            click.echo(f"{collection}: {', '.join(names)}")
+
+    @app.cli.command('check-query-plans')
+    def check_query_plans():
+        """Explain every model query and fail if any of them uses a COLLSCAN."""
+        results=find_collection_scans()
+        for result in results:
+            status='COLLSCAN' if result['collscan'] else 'ok'
+            click.echo(f"{status:<8} {result['collection']}.{result['query']}: {' > '.join(result['stages'])}")
+        if any(result['collscan'] for result in results):
+            raise click.ClickException('Collection scans found; run flask ensure-indexes')
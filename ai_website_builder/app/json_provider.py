@@ -0,0 +1,60 @@
+from datetime import date, datetime, timezone
+from bson.objectid import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson=None
+
+
+def mongo_default(obj):
+    """Encode the BSON types our documents carry; everything else goes to Flask's default."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        # PyMongo returns naive datetimes that are always UTC
+        if obj.tzinfo is None:
+            obj=obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """JSON provider that serialises ObjectId and datetime while encoding, in a single pass.
+
+    Uses orjson when it is installed and falls back to the standard library
+    encoder otherwise. The compact and ``indent=2`` layouts that ``response()``
+    asks for are mapped onto orjson options; any other formatting argument
+    goes to the standard library encoder.
+    """
+
+    default=staticmethod(mongo_default)
+
+    def dumps(self, obj, **kwargs):
+        option=self._orjson_option(kwargs)
+        if option is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def _orjson_option(self, kwargs):
+        """orjson options equivalent to the json.dumps arguments, or None if orjson cannot honour them."""
+        if orjson is None:
+            return None
+        kwargs=dict(kwargs)
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        # orjson only writes compact or two-space indented output
+        if kwargs.pop('separators', None) not in (None, (',', ':')):
+            return None
+        indent=kwargs.pop('indent', None)
+        if indent == 2:
+            option|=orjson.OPT_INDENT_2
+        elif indent is not None:
+            return None
+        if kwargs.pop('sort_keys', self.sort_keys):
+            option|=orjson.OPT_SORT_KEYS
+        if kwargs:
+            return None
+        return option
@@ -0,0 +1,112 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER='X-Request-ID'
+
+_listener=None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request's correlation id ('-' outside a request)."""
+
+    def filter(self, record):
+        record.request_id=g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry={
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc_info']=self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that queues the record as is.
+
+    The stock prepare() formats the record on the calling thread and folds the
+    traceback into the message. Records here stay in-process, so message
+    interpolation, traceback formatting and exc_info all reach the listener's
+    formatter untouched.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+TEXT_FORMAT='%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+
+def make_formatter(log_format):
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(app):
+    """Route the ``app`` logger through a queue drained by a background listener thread.
+
+    Request handlers only pay for enqueueing a record; formatting and writing
+    to stderr happen on the listener thread. Level and format come from
+    LOG_LEVEL and LOG_FORMAT.
+    """
+    global _listener
+
+    stream_handler=logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(make_formatter(app.config.get('LOG_FORMAT', 'text')))
+
+    log_queue=queue.Queue(-1)
+    queue_handler=DeferredQueueHandler(log_queue)
+    # The request id has to be read on the request thread, before the record is queued
+    queue_handler.addFilter(RequestIdFilter())
+
+    _stop_listener()
+    _listener=logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Flask names app.logger after the import name, which is also our package logger
+    logger=logging.getLogger('app')
+    logger.handlers=[queue_handler]
+    logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+    logger.propagate=False
+
+    app.before_request(assign_request_id)
+    app.after_request(add_request_id_header)
+
+
+def assign_request_id():
+    request_id=request.headers.get(REQUEST_ID_HEADER, '')
+    if not (0 < len(request_id) <= 64 and request_id.isprintable()):
+        request_id=uuid.uuid4().hex
+    g.request_id=request_id
+
+
+def add_request_id_header(response):
+    request_id=g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER]=request_id
+    return response
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener=None
+
+
+atexit.register(_stop_listener)
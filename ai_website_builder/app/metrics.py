@@ -0,0 +1,232 @@
+import threading
+import time
+from flask import g, request
+from pymongo import monitoring
+
+DEFAULT_BUCKETS=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs=list(zip(labelnames, values)) + (extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    TYPE=None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name=name
+        self.documentation=documentation
+        self.labelnames=tuple(labelnames)
+        self._values={}
+        self._lock=threading.Lock()
+
+    def render(self):
+        lines=[f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.TYPE}']
+        with self._lock:
+            items=sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._render_sample(labels, value))
+        return lines
+
+    def _render_sample(self, labels, value):
+        return [f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}']
+
+
+class Counter(Metric):
+    TYPE='counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels]=self._values.get(labels, 0) + amount
+
+    def total(self):
+        with self._lock:
+            return sum(self._values.values())
+
+
+class Gauge(Metric):
+    TYPE='gauge'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels]=self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels]=value
+
+
+class Histogram(Metric):
+    TYPE='histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets=tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        with self._lock:
+            state=self._values.get(labels)
+            if state is None:
+                state=self._values[labels]=[[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i]+=1
+                    break
+            state[1]+=value
+            state[2]+=1
+
+    def render(self):
+        with self._lock:
+            items=sorted((labels, ([*state[0]], state[1], state[2])) for labels, state in self._values.items())
+        lines=[f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.TYPE}']
+        for labels, (counts, total, count) in items:
+            cumulative=0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts + [count - sum(counts)]):
+                cumulative+=bucket_count
+                le=_format_labels(self.labelnames, labels, [('le', _format_value(float(bound)))])
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            label_text=_format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics=[]
+        self._collectors=[]
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def on_collect(self, callback):
+        """Run callback before every render, for gauges read from live state."""
+        self._collectors.append(callback)
+
+    def render(self):
+        for callback in self._collectors:
+            callback()
+        lines=[]
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry=Registry()
+
+http_requests=registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route and status code.',
+    ('blueprint', 'endpoint', 'method', 'status')))
+http_request_duration=registry.register(Histogram(
+    'http_request_duration_seconds', 'Time from the start of the request until its body was produced.',
+    ('blueprint', 'endpoint', 'method')))
+http_requests_in_flight=registry.register(Gauge(
+    'http_requests_in_flight', 'Requests currently being handled.'))
+
+mongo_commands=registry.register(Counter(
+    'mongodb_commands_total', 'MongoDB commands by collection, command and outcome.',
+    ('collection', 'command', 'outcome')))
+mongo_command_duration=registry.register(Histogram(
+    'mongodb_command_duration_seconds', 'MongoDB command round-trip time.',
+    ('collection', 'command'),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)))
+
+gemini_calls=registry.register(Counter(
+    'gemini_calls_total', 'Gemini calls by kind and outcome.', ('kind', 'outcome')))
+gemini_call_duration=registry.register(Histogram(
+    'gemini_call_duration_seconds', 'Gemini call duration, including streamed responses.', ('kind',)))
+gemini_circuit_state=registry.register(Gauge(
+    'gemini_circuit_state', 'Gemini circuit breaker state (0 closed, 1 half open, 2 open).'))
+
+CIRCUIT_STATES={'closed': 0, 'half_open': 1, 'open': 2}
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Times every MongoDB command per collection; passed to the client as an event listener."""
+
+    def __init__(self):
+        self._pending={}
+
+    def started(self, event):
+        collection=event.command.get(event.command_name)
+        if event.command_name == 'getMore':
+            collection=event.command.get('collection')
+        if not isinstance(collection, str):
+            collection='-'
+        self._pending[(event.connection_id, event.request_id)]=collection
+
+    def succeeded(self, event):
+        self._record(event, 'success')
+
+    def failed(self, event):
+        self._record(event, 'failure')
+
+    def _record(self, event, outcome):
+        collection=self._pending.pop((event.connection_id, event.request_id), '-')
+        mongo_commands.inc(collection, event.command_name, outcome)
+        mongo_command_duration.observe(event.duration_micros / 1e6, collection, event.command_name)
+
+
+command_listener=CommandMetricsListener()
+
+
+def observe_gemini(kind, outcome, duration):
+    gemini_calls.inc(kind, outcome)
+    gemini_call_duration.observe(duration, kind)
+
+
+def _route_labels():
+    return (request.blueprint or '-', request.endpoint or 'unmatched', request.method)
+
+
+def _start_request():
+    g.metrics_start=time.perf_counter()
+    g.metrics_status='500'
+    http_requests_in_flight.inc()
+
+
+def _record_response(response):
+    # after_request is skipped when the handler raised, leaving the 500 default
+    g.metrics_status=str(response.status_code)
+    return response
+
+
+def _finish_request(error=None):
+    # Teardown runs once a stream_with_context body has been fully sent, so
+    # streamed listings and SSE are timed to their last chunk
+    start=g.get('metrics_start')
+    if start is None:
+        return
+    labels=_route_labels()
+    http_request_duration.observe(time.perf_counter() - start, *labels)
+    http_requests.inc(*labels, g.get('metrics_status', '500'))
+    http_requests_in_flight.dec()
+
+
+def init_app(app):
+    app.before_request(_start_request)
+    app.after_request(_record_response)
+    app.teardown_request(_finish_request)
+
+    def collect_circuit_state():
+        service=app.extensions.get('gemini_service')
+        if service is not None:
+            gemini_circuit_state.set(CIRCUIT_STATES.get(service.breaker.state, 0))
+    registry.on_collect(collect_circuit_state)
@@ -1,7 +1,10 @@
+import logging
 from functools import wraps
 from flask import request, jsonify
 from app.auth.utils import get_user_from_token
 
+logger=logging.getLogger(__name__)
+
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -29,7 +32,7 @@ def require_auth(f):
             return f(*args, **kwargs)
             
         except Exception as e:
-            print(f"Authentication error: {str(e)}")
+            logger.exception("Authentication error")
             return jsonify({'error': 'Authentication failed'}), 401
     
     return decorated_function
\ No newline at end of file
@@ -1,7 +1,12 @@
+import logging
 from functools import wraps
 from flask import request, jsonify
+from app.models.permission import Permission
+
+logger=logging.getLogger(__name__)
 
 def require_permission(permission):
+    permission_bit = Permission.bit(permission)
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -13,16 +18,18 @@ def require_permission(permission):
                 if not user_role:
                     return jsonify({'error': 'User role not found'}), 403
                 
-                user_permissions = user_role.get('permissions', [])
+                permission_mask = user_role.get('permission_mask')
+                if permission_mask is None:
+                    permission_mask = Permission.to_mask(user_role.get('permissions', []))
                 
-                if permission not in user_permissions:
+                if not permission_mask & permission_bit:
                     return jsonify({
                         'error': f'Insufficient permissions. Required: {permission}',
-                        'user_permissions': user_permissions}), 403
+                        'user_permissions': user_role.get('permissions', [])}), 403
                 
                 return f(*args, **kwargs)
             except Exception as e:
-                print(f"Permission check error: {str(e)}")
+                logger.exception("Permission check error")
                 return jsonify({'error': 'Permission check failed'}), 500
         return decorated_function
     return decorator
@@ -43,7 +50,7 @@ def require_role(role_name):
                 
                 return f(*args, **kwargs)
             except Exception as e:
-                print(f"Role check error: {str(e)}")
+                logger.exception("Role check error")
                 return jsonify({'error': 'Role check failed'}), 500
         return decorated_function
     return decorator
\ No newline at end of file
@@ -0,0 +1,60 @@
+import logging
+from functools import wraps
+from flask import request, jsonify, current_app
+from pymongo.errors import PyMongoError
+from app.services.rate_limiter import RateLimiter
+
+logger=logging.getLogger(__name__)
+
+def get_quota(scope, role_name):
+    quotas = current_app.config['RATE_LIMITS'][scope]
+    return quotas.get(role_name) or quotas['default']
+
+def too_many_requests(message, retry_after):
+    response = jsonify({'error': message, 'retry_after': retry_after})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def require_rate_limit(scope, cost=None, global_scope=None):
+    """Debit the caller's per-role quota and the shared upstream bucket for this scope.
+
+    cost is an optional callable returning how many tokens the request uses.
+    global_scope names another scope whose upstream bucket is debited instead.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+                return f(*args, **kwargs)
+            if not hasattr(request, 'current_user'):
+                return jsonify({'error': 'Authentication required'}), 401
+            
+            tokens = cost() if cost else 1
+            user_role = request.current_user.get('role') or {}
+            quota = get_quota(scope, user_role.get('name'))
+            global_scope_name = global_scope or scope
+            global_quota = get_quota(global_scope_name, 'global')
+            if tokens > quota['capacity']:
+                return jsonify({
+                    'error': f"Request needs {tokens} {scope} tokens but your quota holds {quota['capacity']}"}), 400
+            user_key = f"{scope}:user:{request.current_user['_id']}"
+            global_key = f"{global_scope_name}:global"
+            
+            try:
+                allowed, _, retry_after = RateLimiter.consume(
+                    user_key, quota['capacity'], quota['per_minute'] / 60, tokens)
+                if not allowed:
+                    return too_many_requests(f'Rate limit exceeded for {scope}', retry_after)
+                
+                allowed, _, retry_after = RateLimiter.consume(
+                    global_key, global_quota['capacity'], global_quota['per_minute'] / 60, tokens)
+                if not allowed:
+                    RateLimiter.refund(user_key, tokens)
+                    return too_many_requests(f'Service is busy, {scope} capacity exhausted', retry_after)
+            except PyMongoError as e:
+                # Fail open: an unavailable limiter store must not take generation down with it
+                logger.warning("Rate limiter error: %s", e)
+            
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,105 @@
+from app import mongo
+from bson.objectid import ObjectId
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+
+class GenerationJob:
+    COLLECTION = 'generation_jobs'
+    # One index per find_recoverable branch: stale queued jobs and expired leases
+    INDEXES = [
+        {'keys': [('status', 1), ('lease_expires_at', 1)]},
+        {'keys': [('status', 1), ('updated_at', 1)]},
+    ]
+    QUERY_PLANS = [
+        ('find_by_id', {'_id': ObjectId()}, None),
+        ('find_recoverable', {'$or': [
+            {'status': 'queued', 'updated_at': {'$lt': datetime.now(timezone.utc)}},
+            {'status': 'running', 'lease_expires_at': {'$lt': datetime.now(timezone.utc)}}]}, None),
+    ]
+    
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    FINISHED_STATUSES = (SUCCEEDED, FAILED)
+    
+    def __init__(self, owner_id, params):
+        self.owner_id = owner_id
+        self.params = params
+        self.status = GenerationJob.QUEUED
+        self.created_at = datetime.now(timezone.utc)
+        self.updated_at = datetime.now(timezone.utc)
+    
+    def save(self):
+        job_data = {
+            'owner_id': ObjectId(self.owner_id),
+            'params': self.params,
+            'status': self.status,
+            'attempts': 0,
+            'website_id': None,
+            'error': None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at}
+        result = mongo.db.generation_jobs.insert_one(job_data)
+        return str(result.inserted_id)
+    
+    @staticmethod
+    def find_by_id(job_id):
+        return mongo.db.generation_jobs.find_one({'_id': ObjectId(job_id)})
+    
+    @staticmethod
+    def claim(job_id, worker_id, lease_seconds):
+        """Atomically take a queued (or abandoned running) job; None if someone else holds it."""
+        now = datetime.now(timezone.utc)
+        return mongo.db.generation_jobs.find_one_and_update(
+            {
+                '_id': ObjectId(job_id),
+                '$or': [
+                    {'status': GenerationJob.QUEUED},
+                    {'status': GenerationJob.RUNNING, 'lease_expires_at': {'$lt': now}}]
+            },
+            {
+                '$set': {
+                    'status': GenerationJob.RUNNING,
+                    'worker_id': worker_id,
+                    'lease_expires_at': now + timedelta(seconds=lease_seconds),
+                    'started_at': now,
+                    'updated_at': now},
+                '$inc': {'attempts': 1}
+            },
+            return_document=ReturnDocument.AFTER)
+    
+    @staticmethod
+    def mark_succeeded(job_id, website_id):
+        now = datetime.now(timezone.utc)
+        return mongo.db.generation_jobs.update_one(
+            {'_id': ObjectId(job_id)},
+            {'$set': {
+                'status': GenerationJob.SUCCEEDED,
+                'website_id': ObjectId(website_id),
+                'finished_at': now,
+                'updated_at': now},
+             '$unset': {'lease_expires_at': ''}})
+    
+    @staticmethod
+    def mark_failed(job_id, error):
+        now = datetime.now(timezone.utc)
+        return mongo.db.generation_jobs.update_one(
+            {'_id': ObjectId(job_id)},
+            {'$set': {
+                'status': GenerationJob.FAILED,
+                'error': error,
+                'finished_at': now,
+                'updated_at': now},
+             '$unset': {'lease_expires_at': ''}})
+    
+    @staticmethod
+    def find_recoverable(queued_before):
+        """Ids of jobs nobody is working on: queued since before the cutoff, or running past their lease."""
+        now = datetime.now(timezone.utc)
+        cursor = mongo.db.generation_jobs.find(
+            {'$or': [
+                {'status': GenerationJob.QUEUED, 'updated_at': {'$lt': queued_before}},
+                {'status': GenerationJob.RUNNING, 'lease_expires_at': {'$lt': now}}]},
+            {'_id': 1})
+        return [str(job['_id']) for job in cursor]
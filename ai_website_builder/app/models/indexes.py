@@ -0,0 +1,52 @@
+from pymongo import IndexModel
+from app import mongo
+from app.models.user import User
+from app.models.role import Role
+from app.models.website import Website
+from app.models.generation_job import GenerationJob
+from app.models.token_version import TokenVersion
+from app.services.generation_cache import GenerationCache
+from app.services.rate_limiter import RateLimiter
+
+# Every class that declares COLLECTION, INDEXES and QUERY_PLANS
+MODELS=[User, Role, Website, GenerationJob, TokenVersion, GenerationCache, RateLimiter]
+
+def ensure_indexes():
+    """Create every declared index. create_indexes is a no-op for indexes that already exist."""
+    created={}
+    for model in MODELS:
+        index_models=[
+            IndexModel(spec['keys'], **{k: v for k, v in spec.items() if k != 'keys'})
+            for spec in model.INDEXES]
+        if index_models:
+            created[model.COLLECTION]=mongo.db[model.COLLECTION].create_indexes(index_models)
+    return created
+
+def plan_stages(plan):
+    stages=[]
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    return stages
+
+def find_collection_scans():
+    """Explain every declared model query and return the ones whose winning plan scans the collection."""
+    results=[]
+    for model in MODELS:
+        for name, query, sort in model.QUERY_PLANS:
+            cursor=mongo.db[model.COLLECTION].find(query)
+            if sort:
+                cursor=cursor.sort(sort)
+            winning_plan=cursor.explain()['queryPlanner']['winningPlan']
+            stages=plan_stages(winning_plan)
+            results.append({
+                'collection': model.COLLECTION,
+                'query': name,
+                'stages': stages,
+                'collscan': 'COLLSCAN' in stages})
+    return results
@@ -19,4 +19,22 @@ class Permission:
     
     @staticmethod
     def is_valid_permission(permission):
-        return permission in Permission.PERMISSIONS
\ No newline at end of file
+        return permission in Permission.PERMISSIONS
+    
+    @staticmethod
+    def bit(permission):
+        return Permission.BITS.get(permission, 0)
+    
+    @staticmethod
+    def to_mask(permissions):
+        mask=0
+        for permission in permissions:
+            mask |= Permission.BITS.get(permission, 0)
+        return mask
+    
+    @staticmethod
+    def from_mask(mask):
+        return [p for p in Permission.PERMISSIONS if mask & Permission.BITS[p]]
+
+# Bit position is the index in PERMISSIONS, so only ever append to that list
+Permission.BITS={p: 1 << i for i, p in enumerate(Permission.PERMISSIONS)}
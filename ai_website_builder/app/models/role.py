@@ -1,8 +1,24 @@
+import logging
 from app import mongo
+from app.services.principal_cache import principal_cache
+from app.services.role_version_cache import role_version_cache
 from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timezone
 
+logger=logging.getLogger(__name__)
+
 class Role:
+    COLLECTION = 'roles'
+    INDEXES = [
+        {'keys': [('name', 1)], 'unique': True},
+    ]
+    QUERY_PLANS = [
+        ('find_by_name', {'name': 'admin'}, None),
+        ('find_by_id', {'_id': ObjectId()}, None),
+    ]
+    
     def __init__(self, name, description, permissions=None):
         self.name = name
         self.description = description
@@ -33,38 +49,69 @@ class Role:
     def get_all_roles():
         return list(mongo.db.roles.find({}))
     
+    @staticmethod
+    def estimated_count():
+        return mongo.db.roles.estimated_document_count()
+    
     @staticmethod
     def update_role(role_id, data):
         data['updated_at'] = datetime.now(timezone.utc)
-        return mongo.db.roles.update_one(
+        result = mongo.db.roles.update_one(
             {'_id': ObjectId(role_id)},
-            {'$set': data}
+            {'$set': data, '$inc': {'version': 1}}
         )
+        principal_cache.invalidate_role(role_id)
+        role_version_cache.invalidate()
+        return result
     
     @staticmethod
     def delete_role(role_id):
-        return mongo.db.roles.delete_one({'_id': ObjectId(role_id)})
+        result = mongo.db.roles.delete_one({'_id': ObjectId(role_id)})
+        principal_cache.invalidate_role(role_id)
+        role_version_cache.invalidate()
+        return result
     
+    @staticmethod
+    def get_versions():
+        return {
+            str(role['_id']): role.get('version', 0)
+            for role in mongo.db.roles.find({}, {'version': 1})}
+    
+    DEFAULT_ROLES = [
+        {
+            'name': 'admin',
+            'description': 'Full access to all resources',
+            'permissions': ['create_website', 'read_website', 'update_website', 'delete_website', 
+                        'manage_users', 'manage_roles', 'manage_permissions']},
+        {
+            'name': 'editor',
+            'description': 'Can create and edit websites',
+            'permissions': ['create_website', 'read_website', 'update_website']},
+        {
+            'name': 'viewer',
+            'description': 'Can only view websites',
+            'permissions': ['read_website']}]
+
     @staticmethod
     def create_default_roles():
-        default_roles = [
-            {
-                'name': 'admin',
-                'description': 'Full access to all resources',
-                'permissions': ['create_website', 'read_website', 'update_website', 'delete_website', 
-                            'manage_users', 'manage_roles', 'manage_permissions']},
-            {
-                'name': 'editor',
-                'description': 'Can create and edit websites',
-                'permissions': ['create_website', 'read_website', 'update_website']},
-            {
-                'name': 'viewer',
-                'description': 'Can only view websites',
-                'permissions': ['read_website']}]
+        """Insert any missing default role in one bulk upsert; existing roles are left untouched."""
+        now = datetime.now(timezone.utc)
+        requests = [
+            UpdateOne(
+                {'name': role_data['name']},
+                {'$setOnInsert': dict(role_data, created_at=now, updated_at=now)},
+                upsert=True)
+            for role_data in Role.DEFAULT_ROLES]
+        try:
+            result = mongo.db.roles.bulk_write(requests, ordered=False)
+            upserted = result.upserted_ids
+        except BulkWriteError as e:
+            # Another process inserted the same role first; the unique index rejected ours
+            if any(error['code'] != 11000 for error in e.details['writeErrors']):
+                raise
+            upserted = {item['index']: item['_id'] for item in e.details.get('upserted', [])}
 
-        for role_data in default_roles:
-            if not mongo.db.roles.find_one({'name': role_data['name']}):
-                role_data['created_at'] = datetime.now(timezone.utc)
-                role_data['updated_at'] = datetime.now(timezone.utc)
-                mongo.db.roles.insert_one(role_data)
-                print(f"Created default role: {role_data['name']}")
\ No newline at end of file
+        created = [Role.DEFAULT_ROLES[index]['name'] for index in sorted(upserted)]
+        for name in created:
+            logger.info("Created default role: %s", name)
+        return created
@@ -0,0 +1,48 @@
+import time
+from app import mongo
+from bson.objectid import ObjectId
+from datetime import datetime, timedelta, timezone
+from app.services.token_version_cache import token_version_cache
+
+class TokenVersion:
+    """Per-user token version, bumped whenever a user's issued claims go stale.
+
+    A document only needs to outlive the tokens issued before its last bump,
+    so it expires one token lifetime later. Versions are bump timestamps in
+    milliseconds, which keeps a recreated document from reusing an old value.
+    """
+
+    COLLECTION = 'token_versions'
+    INDEXES = [
+        {'keys': [('expires_at', 1)], 'expireAfterSeconds': 0},
+    ]
+    QUERY_PLANS = [
+        ('find_by_user', {'_id': ObjectId()}, None),
+        ('get_versions', {'expires_at': {'$gt': datetime.now(timezone.utc)}}, None),
+    ]
+
+    @staticmethod
+    def get(user_id):
+        """The version to embed in a new token for user_id; 0 if it was never bumped recently."""
+        doc = mongo.db.token_versions.find_one({'_id': ObjectId(user_id)}, {'version': 1})
+        return doc['version'] if doc else 0
+
+    @staticmethod
+    def bump(user_id):
+        now = datetime.now(timezone.utc)
+        result = mongo.db.token_versions.update_one(
+            {'_id': ObjectId(user_id)},
+            {
+                '$max': {'version': int(time.time() * 1000)},
+                '$set': {'expires_at': now + timedelta(seconds=token_version_cache.lifetime)}
+            },
+            upsert=True)
+        token_version_cache.invalidate()
+        return result
+
+    @staticmethod
+    def get_versions():
+        return {
+            str(doc['_id']): doc['version']
+            for doc in mongo.db.token_versions.find(
+                {'expires_at': {'$gt': datetime.now(timezone.utc)}}, {'version': 1})}
@@ -1,11 +1,35 @@
+import logging
 from app import mongo
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.principal_cache import principal_cache
+from app.services.credential_service import CredentialService
+from app.models.token_version import TokenVersion
 from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-import bcrypt
 from datetime import timezone
 
+logger=logging.getLogger(__name__)
+
 class User:
+    COLLECTION='users'
+    INDEXES=[
+        {'keys': [('email', 1)], 'unique': True},
+        # Filtered admin listings page by _id within a role or status
+        {'keys': [('role_id', 1), ('_id', 1)]},
+        {'keys': [('is_active', 1), ('_id', 1)]},
+    ]
+    # (name, filter, sort) for every query issued by this model, checked by check-query-plans
+    QUERY_PLANS=[
+        ('find_by_email', {'email': 'admin@admin.com'}, None),
+        ('find_by_id', {'_id': ObjectId()}, None),
+        ('list_with_roles', {'_id': {'$gt': ObjectId()}}, [('_id', 1)]),
+        ('list_with_roles_by_role', {'role_id': ObjectId(), '_id': {'$gt': ObjectId()}}, [('_id', 1)]),
+        ('list_with_roles_active', {'is_active': {'$ne': False}, '_id': {'$gt': ObjectId()}}, [('_id', 1)]),
+        ('list_with_roles_inactive', {'is_active': False, '_id': {'$gt': ObjectId()}}, [('_id', 1)]),
+        ('count_users_by_role', {'role_id': ObjectId()}, None),
+        ('count_users_inactive', {'is_active': False}, None),
+    ]
+    
     def __init__(self, email, password, role_id=None, is_active=True):
         self.email=email
         self.password_hash=self.hash_password(password)
@@ -14,11 +38,26 @@ class User:
         self.created_at=datetime.now(timezone.utc)
         self.updated_at=datetime.now(timezone.utc)
     
+    @classmethod
+    def from_document(cls, user_data):
+        """Build a User from a stored document without hashing anything."""
+        user=cls.__new__(cls)
+        user.email=user_data['email']
+        user.password_hash=user_data.get('password_hash')
+        user.role_id=user_data.get('role_id')
+        user.is_active=user_data.get('is_active', True)
+        user.created_at=user_data.get('created_at')
+        user.updated_at=user_data.get('updated_at')
+        return user
+    
     def hash_password(self, password):
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return CredentialService.hash_password(password)
     
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return CredentialService.verify_password(password, self.password_hash)
+    
+    def needs_rehash(self):
+        return CredentialService.needs_rehash(self.password_hash)
     
     def save(self):
         user_data={
@@ -44,9 +83,58 @@ class User:
     def get_all_users():
         return list(mongo.db.users.find({}))
     
+    @staticmethod
+    def build_filter(role_id=None, is_active=None):
+        query={}
+        if role_id is not None:
+            query['role_id']=ObjectId(role_id)
+        if is_active is True:
+            query['is_active']={'$ne': False}
+        elif is_active is False:
+            query['is_active']=False
+        return query
+    
+    @staticmethod
+    def estimated_count():
+        return mongo.db.users.estimated_document_count()
+    
+    @staticmethod
+    def count_users(role_id=None, is_active=None):
+        query=User.build_filter(role_id, is_active)
+        if not query:
+            return User.estimated_count()
+        return mongo.db.users.count_documents(query)
+    
+    @staticmethod
+    def list_with_roles(after=None, limit=50, role_id=None, is_active=None, batch_size=None):
+        """One page of users ordered by _id with the role name joined in, never the password hash."""
+        query=User.build_filter(role_id, is_active)
+        if after is not None:
+            query['_id']={'$gt': ObjectId(after)}
+        pipeline=[
+            {'$match': query},
+            {'$sort': {'_id': 1}},
+            {'$limit': limit},
+            {'$project': {'password_hash': 0}},
+            {'$lookup': {
+                'from': 'roles',
+                'localField': 'role_id',
+                'foreignField': '_id',
+                'as': 'role_docs'}},
+            {'$addFields': {
+                'role': {'$cond': [
+                    {'$ifNull': ['$role_id', False]},
+                    {'$ifNull': [{'$arrayElemAt': ['$role_docs.name', 0]}, 'unknown']},
+                    'no_role']}}},
+            {'$project': {'role_docs': 0}},
+        ]
+        if batch_size:
+            return mongo.db.users.aggregate(pipeline, batchSize=batch_size)
+        return mongo.db.users.aggregate(pipeline)
+    
     @staticmethod
     def update_user_role(user_id, role_id):
-        return mongo.db.users.update_one(
+        result=mongo.db.users.update_one(
             {'_id': ObjectId(user_id)},
             {
                 '$set': {
@@ -55,15 +143,41 @@ class User:
                 }
             },
         )
+        principal_cache.invalidate_user(user_id)
+        TokenVersion.bump(user_id)
+        return result
+    
+    @staticmethod
+    def update_password_hash(user_id, password_hash):
+        result=mongo.db.users.update_one(
+            {'_id': ObjectId(user_id)},
+            {
+                '$set': {
+                    'password_hash': password_hash,
+                    'updated_at': datetime.now(timezone.utc),
+                }
+            },
+        )
+        principal_cache.invalidate_user(user_id)
+        return result
     
     @staticmethod
     def delete_user(user_id):
-        return mongo.db.users.delete_one({'_id': ObjectId(user_id)})
+        result=mongo.db.users.delete_one({'_id': ObjectId(user_id)})
+        principal_cache.invalidate_user(user_id)
+        TokenVersion.bump(user_id)
+        return result
     
     @staticmethod
     def create_admin_user():
-        admin_role=mongo.db.roles.find_one({'name': 'admin'})
-        if admin_role and not mongo.db.users.find_one({'email': 'admin@admin.com'}):
-            admin_user=User('admin@admin.com', 'admin123', admin_role['_id'])
-            admin_user.save()
-            print("Default admin user created: admin@admin.com / admin123")
\ No newline at end of file
+        """Create the default admin unless it exists; the password is only hashed when it is needed."""
+        admin_role=mongo.db.roles.find_one({'name': 'admin'}, {'_id': 1})
+        if not admin_role or mongo.db.users.find_one({'email': 'admin@admin.com'}, {'_id': 1}):
+            return False
+        try:
+            User('admin@admin.com', 'admin123', admin_role['_id']).save()
+        except DuplicateKeyError:
+            # Created concurrently by another process
+            return False
+        logger.info("Default admin user created: admin@admin.com")
+        return True
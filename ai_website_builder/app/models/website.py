@@ -1,8 +1,47 @@
+import logging
 from app import mongo
+from app.services.preview_cache import preview_cache
+from app.services.static_site_service import StaticSiteService
 from bson.objectid import ObjectId
 from datetime import datetime, timezone
 
+logger=logging.getLogger(__name__)
+
+def keyset_after(after):
+    """Filter for documents after (updated_at, _id) in list_page's descending order."""
+    updated_at, last_id = after
+    return {'$or': [
+        {'updated_at': {'$lt': updated_at}},
+        {'updated_at': updated_at, '_id': {'$lt': last_id}}]}
+
+AFTER_PLACEHOLDER = (datetime.now(timezone.utc), ObjectId())
+
 class Website:
+    COLLECTION = 'websites'
+    # _id trails each compound key so keyset pages sort entirely in the index
+    INDEXES = [
+        {'keys': [('owner_id', 1), ('updated_at', -1), ('_id', -1)]},
+        {'keys': [('is_published', 1), ('updated_at', -1), ('_id', -1)]},
+        {'keys': [('updated_at', -1), ('_id', -1)]},
+    ]
+    QUERY_PLANS = [
+        ('find_by_id', {'_id': ObjectId()}, None),
+        ('find_by_owner', {'owner_id': ObjectId()}, None),
+        ('get_published_websites', {'is_published': True}, None),
+        ('list_page:owner', {'owner_id': ObjectId()}, [('updated_at', -1), ('_id', -1)]),
+        ('list_page:published', {'is_published': True}, [('updated_at', -1), ('_id', -1)]),
+        ('list_page:all', {}, [('updated_at', -1), ('_id', -1)]),
+        # Page 2 onwards adds the keyset continuation built by list_page
+        ('list_page:owner:after', dict(owner_id=ObjectId(), **keyset_after(AFTER_PLACEHOLDER)),
+         [('updated_at', -1), ('_id', -1)]),
+        ('list_page:published:after', dict(is_published=True, **keyset_after(AFTER_PLACEHOLDER)),
+         [('updated_at', -1), ('_id', -1)]),
+        ('list_page:all:after', keyset_after(AFTER_PLACEHOLDER), [('updated_at', -1), ('_id', -1)]),
+    ]
+    
+    LISTABLE_FIELDS = ['title', 'content', 'owner_id', 'business_type', 'industry',
+                    'template_id', 'is_published', 'created_at', 'updated_at']
+    
     def __init__(self, title, content, owner_id, business_type=None, industry=None, 
                 template_id=None, is_published=False):
         self.title = title
@@ -15,8 +54,8 @@ class Website:
         self.created_at = datetime.now(timezone.utc)
         self.updated_at = datetime.now(timezone.utc)
     
-    def save(self):
-        website_data = {
+    def to_document(self):
+        return {
             'title': self.title,
             'content': self.content,
             'owner_id': ObjectId(self.owner_id),
@@ -26,9 +65,19 @@ class Website:
             'is_published': self.is_published,
             'created_at': self.created_at,
             'updated_at': self.updated_at}
-        result = mongo.db.websites.insert_one(website_data)
+    
+    def save(self):
+        result = mongo.db.websites.insert_one(self.to_document())
         return str(result.inserted_id)
     
+    @staticmethod
+    def insert_many(websites):
+        """Insert several Website objects in one round trip; returns their ids in order."""
+        if not websites:
+            return []
+        result = mongo.db.websites.insert_many([website.to_document() for website in websites])
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
     @staticmethod
     def find_by_id(website_id):
         return mongo.db.websites.find_one({'_id': ObjectId(website_id)})
@@ -37,22 +86,69 @@ class Website:
     def find_by_owner(owner_id):
         return list(mongo.db.websites.find({'owner_id': ObjectId(owner_id)}))
     
+    @staticmethod
+    def list_page(owner_id=None, published_only=False, after=None, limit=50, fields=None, batch_size=None):
+        """One page ordered by (updated_at, _id) descending, continuing after the given key."""
+        query = {}
+        if owner_id is not None:
+            query['owner_id'] = ObjectId(owner_id)
+        if published_only:
+            query['is_published'] = True
+        if after is not None:
+            query.update(keyset_after(after))
+        
+        projection = None
+        if fields is not None:
+            projection = {field: 1 for field in fields}
+            projection['updated_at'] = 1
+        
+        cursor = (mongo.db.websites.find(query, projection)
+                  .sort([('updated_at', -1), ('_id', -1)])
+                  .limit(limit))
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
+    
     @staticmethod
     def get_all_websites():
         return list(mongo.db.websites.find({}))
     
+    @staticmethod
+    def estimated_count():
+        return mongo.db.websites.estimated_document_count()
+    
+    @staticmethod
+    def count_published():
+        return mongo.db.websites.count_documents({'is_published': True})
+    
     @staticmethod
     def update_website(website_id, data):
         data['updated_at'] = datetime.now(timezone.utc)
-        return mongo.db.websites.update_one(
+        result = mongo.db.websites.update_one(
             {'_id': ObjectId(website_id)},
             {'$set': data}
         )
+        preview_cache.invalidate(website_id)
+        if StaticSiteService.PUBLISH_FIELDS & data.keys():
+            try:
+                StaticSiteService.sync(website_id, Website.find_by_id(website_id))
+            except OSError as e:
+                logger.warning("Static publish failed for website %s: %s", website_id, e)
+        return result
     
     @staticmethod
     def delete_website(website_id):
-        return mongo.db.websites.delete_one({'_id': ObjectId(website_id)})
+        result = mongo.db.websites.delete_one({'_id': ObjectId(website_id)})
+        preview_cache.invalidate(website_id)
+        try:
+            StaticSiteService.remove(website_id)
+        except OSError as e:
+            logger.warning("Static artifact removal failed for website %s: %s", website_id, e)
+        return result
     
     @staticmethod
-    def get_published_websites():
-        return list(mongo.db.websites.find({'is_published': True}))
\ No newline at end of file
+    def get_published_websites(batch_size=None):
+        cursor = mongo.db.websites.find({'is_published': True})
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
\ No newline at end of file
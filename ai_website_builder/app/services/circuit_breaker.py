@@ -0,0 +1,117 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+_END=object()
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CallTimeout(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Fails fast while an upstream dependency is unhealthy.
+
+    After failure_threshold consecutive failures (errors or calls exceeding
+    call_timeout) the circuit opens and calls raise CircuitOpen immediately.
+    Once reset_timeout has passed a single probe call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    CLOSED='closed'
+    OPEN='open'
+    HALF_OPEN='half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, call_timeout=20, max_workers=16):
+        self.failure_threshold=failure_threshold
+        self.reset_timeout=reset_timeout
+        self.call_timeout=call_timeout
+        self.state=CircuitBreaker.CLOSED
+        self.failures=0
+        self.opened_at=0
+        self._probe_in_flight=False
+        self._lock=threading.Lock()
+        # Calls that overrun their deadline keep running here; the bound
+        # stops a hung upstream from consuming unlimited threads.
+        self._executor=ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='breaker')
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == CircuitBreaker.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpen('Circuit open, skipping upstream call')
+                self.state=CircuitBreaker.HALF_OPEN
+                self._probe_in_flight=False
+            if self.state == CircuitBreaker.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpen('Circuit half-open, probe already in flight')
+                self._probe_in_flight=True
+
+    def record_success(self):
+        with self._lock:
+            self.state=CircuitBreaker.CLOSED
+            self.failures=0
+            self._probe_in_flight=False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures+=1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state=CircuitBreaker.OPEN
+                self.opened_at=time.monotonic()
+            self._probe_in_flight=False
+
+    def _run(self, fn, *args, **kwargs):
+        future=self._executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.call_timeout)
+        except FutureTimeout:
+            raise CallTimeout(f'Upstream call exceeded {self.call_timeout}s')
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result=self._run(fn, *args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def stream(self, fn, *args, **kwargs):
+        """Yield from the iterator fn returns, giving every chunk read its own call_timeout.
+
+        The outcome is recorded when the stream ends, so errors and stalls
+        while reading chunks count as failures. A consumer that stops early
+        counts as a success.
+        """
+        self._before_call()
+        try:
+            iterator=iter(self._run(fn, *args, **kwargs))
+            while True:
+                chunk=self._run(next, iterator, _END)
+                if chunk is _END:
+                    break
+                yield chunk
+        except GeneratorExit:
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'call_timeout': self.call_timeout
+            }
@@ -0,0 +1,224 @@
+import json
+
+
+class ContentParseError(ValueError):
+    pass
+
+
+# Required string fields per section; services is a list of such objects
+WEBSITE_SCHEMA={
+    'hero': {'type': 'object', 'fields': ['title', 'subtitle', 'cta_text']},
+    'about': {'type': 'object', 'fields': ['title', 'content']},
+    'services': {'type': 'list', 'fields': ['title', 'description'], 'min_items': 1},
+    'contact': {'type': 'object', 'fields': ['title', 'content']}
+}
+
+SECTIONS=list(WEBSITE_SCHEMA)
+
+
+def _object_validator(fields):
+    def validate(value):
+        if not isinstance(value, dict):
+            return None
+        if not all(isinstance(value.get(field), str) and value[field].strip() for field in fields):
+            return None
+        return {field: value[field] for field in fields}
+    return validate
+
+
+def _list_validator(fields, min_items):
+    validate_item=_object_validator(fields)
+
+    def validate(value):
+        if not isinstance(value, list):
+            return None
+        items=[item for item in map(validate_item, value) if item is not None]
+        return items if len(items) >= min_items else None
+    return validate
+
+
+def compile_schema(schema):
+    """Turn a section schema into {section: validator}; validators return the cleaned value or None."""
+    validators={}
+    for section, spec in schema.items():
+        if spec['type'] == 'list':
+            validators[section]=_list_validator(spec['fields'], spec.get('min_items', 0))
+        else:
+            validators[section]=_object_validator(spec['fields'])
+    return validators
+
+
+VALIDATORS=compile_schema(WEBSITE_SCHEMA)
+
+
+def extract_json_object(text):
+    """Return the outermost {...} in text, or everything from the first '{' if it never closes."""
+    start=text.find('{')
+    if start == -1:
+        raise ContentParseError('No JSON object in model output')
+
+    depth=0
+    in_string=False
+    escaped=False
+    for i in range(start, len(text)):
+        c=text[i]
+        if in_string:
+            if escaped:
+                escaped=False
+            elif c == '\\':
+                escaped=True
+            elif c == '"':
+                in_string=False
+        elif c == '"':
+            in_string=True
+        elif c in '{[':
+            depth+=1
+        elif c in '}]':
+            depth-=1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def _string_start(out):
+    """Index of the opening quote of the string that ends out, or None."""
+    if not out or out[-1] != '"':
+        return None
+    i=len(out) - 2
+    while i >= 0:
+        if out[i] == '"':
+            backslashes=0
+            while i - backslashes - 1 >= 0 and out[i - backslashes - 1] == '\\':
+                backslashes+=1
+            if backslashes % 2 == 0:
+                return i
+        i-=1
+    return None
+
+
+def _trim_dangling(out, closing):
+    """Drop trailing commas and half-written keys before closing a bracket."""
+    while out:
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] in ',:':
+            out.pop()
+            continue
+        if closing == '}':
+            # A string directly after '{' or ',' is a key that never got its value
+            start=_string_start(out)
+            if start is not None:
+                before=''.join(out[:start]).rstrip()
+                if before.endswith(('{', ',')):
+                    del out[start:]
+                    continue
+        break
+
+
+def repair_json(text):
+    """Remove trailing commas and close an unterminated string or brackets left by truncation."""
+    return _repair(text)[0]
+
+
+def _repair(text):
+    """repair_json, also returning the top-level key whose value the text was cut off in (or None)."""
+    out=[]
+    stack=[]
+    in_string=False
+    escaped=False
+    key_start=None
+    open_key=None
+    for c in text:
+        if in_string:
+            out.append(c)
+            if escaped:
+                escaped=False
+            elif c == '\\':
+                escaped=True
+            elif c == '"':
+                in_string=False
+            continue
+        if c == '"':
+            in_string=True
+            if len(stack) == 1:
+                key_start=len(out)
+            out.append(c)
+        elif c == ':' and len(stack) == 1 and key_start is not None:
+            try:
+                open_key=json.loads(''.join(out[key_start:]))
+            except ValueError:
+                open_key=None
+            out.append(c)
+        elif c in '{[':
+            stack.append('}' if c == '{' else ']')
+            out.append(c)
+        elif c in '}]':
+            _trim_dangling(out, c)
+            if stack:
+                stack.pop()
+            out.append(c)
+        else:
+            out.append(c)
+
+    # Only a section still open at the end lost content; the root object closing is harmless
+    truncated=open_key if len(stack) > 1 else None
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append('"')
+    while stack:
+        closing=stack.pop()
+        _trim_dangling(out, closing)
+        out.append(closing)
+    return ''.join(out), truncated
+
+
+def parse_json_object(text):
+    return _parse_json_object(text)[0]
+
+
+def _parse_json_object(text):
+    """Parsed object plus the top-level key that repair had to cut short, if any."""
+    candidate=extract_json_object(text)
+    truncated=None
+    try:
+        data=json.loads(candidate)
+    except ValueError:
+        repaired, truncated=_repair(candidate)
+        try:
+            data=json.loads(repaired)
+        except ValueError as e:
+            raise ContentParseError(f'Unrepairable model output: {e}') from e
+    if not isinstance(data, dict):
+        raise ContentParseError('Model output is not a JSON object')
+    return data, truncated
+
+
+def validate_content(data):
+    """Split parsed output into (valid sections, names of missing or invalid sections)."""
+    content={}
+    missing=[]
+    for section, validate in VALIDATORS.items():
+        value=validate(data.get(section))
+        if value is None:
+            missing.append(section)
+        else:
+            content[section]=value
+    return content, missing
+
+
+def parse_website_content(text):
+    """Valid sections and missing ones; a section cut off by truncation counts as missing."""
+    data, truncated=_parse_json_object(text)
+    data.pop(truncated, None)
+    return validate_content(data)
+
+
+def describe_sections(sections):
+    """JSON skeleton of the given sections, used to re-ask the model for just those parts."""
+    skeleton={}
+    for section in sections:
+        spec=WEBSITE_SCHEMA[section]
+        fields={field: f'{section.capitalize()} {field}' for field in spec['fields']}
+        skeleton[section]=[fields] * max(spec.get('min_items', 1), 3) if spec['type'] == 'list' else fields
+    return json.dumps(skeleton)
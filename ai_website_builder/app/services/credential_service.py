@@ -0,0 +1,54 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+
+class CredentialService:
+    """Runs bcrypt hashing and verification in a bounded worker pool.
+
+    bcrypt releases the GIL, so capping the pool at the number of cores keeps
+    a burst of logins from oversubscribing the CPU while request threads wait.
+    """
+
+    log_rounds=12
+    max_workers=os.cpu_count() or 2
+
+    _executor=None
+    _lock=threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls.log_rounds=app.config.get('BCRYPT_LOG_ROUNDS', cls.log_rounds)
+        cls.max_workers=app.config.get('BCRYPT_WORKERS') or cls.max_workers
+
+    @classmethod
+    def _get_executor(cls):
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor=ThreadPoolExecutor(
+                        max_workers=cls.max_workers, thread_name_prefix='bcrypt')
+        return cls._executor
+
+    @classmethod
+    def hash_password(cls, password):
+        salt=bcrypt.gensalt(rounds=cls.log_rounds)
+        future=cls._get_executor().submit(bcrypt.hashpw, password.encode('utf-8'), salt)
+        return future.result().decode('utf-8')
+
+    @classmethod
+    def verify_password(cls, password, password_hash):
+        if not password_hash:
+            return False
+        future=cls._get_executor().submit(
+            bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+        return future.result()
+
+    @classmethod
+    def needs_rehash(cls, password_hash):
+        # bcrypt hashes look like $2b$<cost>$<salt+digest>
+        try:
+            return int(password_hash.split('$')[2]) != cls.log_rounds
+        except (IndexError, ValueError):
+            return True
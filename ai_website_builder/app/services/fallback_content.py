@@ -0,0 +1,158 @@
+import copy
+
+# Placeholders filled per request: {company}, {business_type}, {industry}
+SECTION_VARIANTS={
+    'default': {
+        'hero': {
+            'title': 'Welcome to {company}',
+            'subtitle': 'Your trusted partner in {industry}',
+            'cta_text': 'Get Started'
+        },
+        'about': {
+            'title': 'About Us',
+            'content': 'We are a leading {business_type} company specializing in {industry}. With years of experience and dedication to excellence, we provide top-quality services to our clients. Our team is committed to delivering innovative solutions that meet your specific needs.'
+        },
+        'contact': {
+            'title': 'Get In Touch',
+            'content': 'Ready to take your business to the next level? Contact us today to discuss how we can help you achieve your goals.'
+        }
+    },
+    'refresh': {
+        'hero': {
+            'title': 'Welcome to {company}',
+            'subtitle': 'Refreshed content for your {business_type} business',
+            'cta_text': 'Discover More'
+        },
+        'about': {
+            'title': 'About Our Company',
+            'content': 'We continue to lead in {industry} with innovative {business_type} solutions. Our commitment to excellence drives everything we do.'
+        },
+        'contact': {
+            'title': 'Connect With Us',
+            'content': 'Ready to experience the difference? Get in touch today.'
+        }
+    }
+}
+
+DEFAULT_SERVICES=[
+    {'title': 'Professional Consulting', 'description': 'Expert consulting services tailored to {industry} businesses.'},
+    {'title': 'Custom Solutions', 'description': 'Customized solutions designed to meet your unique requirements.'},
+    {'title': 'Support & Maintenance', 'description': 'Ongoing support and maintenance to ensure optimal performance.'}
+]
+
+# Keyed on the industry values offered by the create-website form
+INDUSTRY_SERVICES={
+    'food-service': [
+        {'title': 'Fresh Menu', 'description': 'Seasonal dishes prepared daily from quality ingredients.'},
+        {'title': 'Catering & Events', 'description': 'Full-service catering for gatherings of every size.'},
+        {'title': 'Takeaway & Delivery', 'description': 'Enjoy {company} at home with fast, reliable delivery.'}
+    ],
+    'retail': [
+        {'title': 'Curated Selection', 'description': 'Carefully chosen products that match what our customers love.'},
+        {'title': 'Online Ordering', 'description': 'Shop anytime with convenient online ordering and pickup.'},
+        {'title': 'Customer Care', 'description': 'Easy returns and friendly help before and after every purchase.'}
+    ],
+    'technology': [
+        {'title': 'Software Development', 'description': 'Reliable, scalable software built around your business.'},
+        {'title': 'Cloud & Infrastructure', 'description': 'Modern infrastructure that keeps your systems fast and secure.'},
+        {'title': 'Technical Support', 'description': 'Responsive support from engineers who know your stack.'}
+    ],
+    'healthcare': [
+        {'title': 'Patient Care', 'description': 'Compassionate, personalised care from experienced professionals.'},
+        {'title': 'Preventive Services', 'description': 'Screenings and check-ups that keep you healthy.'},
+        {'title': 'Easy Appointments', 'description': 'Flexible scheduling that fits around your life.'}
+    ],
+    'finance': [
+        {'title': 'Financial Planning', 'description': 'Clear plans that help you reach your financial goals.'},
+        {'title': 'Investment Advice', 'description': 'Guidance grounded in research and your appetite for risk.'},
+        {'title': 'Business Accounts', 'description': 'Banking and bookkeeping support for growing companies.'}
+    ],
+    'education': [
+        {'title': 'Courses & Programs', 'description': 'Structured learning paths for every level.'},
+        {'title': 'Personal Tutoring', 'description': 'One-to-one sessions focused on each learner.'},
+        {'title': 'Online Learning', 'description': 'Flexible lessons you can take from anywhere.'}
+    ],
+    'real-estate': [
+        {'title': 'Buying', 'description': 'Find the right property with expert local guidance.'},
+        {'title': 'Selling', 'description': 'Accurate valuations and marketing that gets results.'},
+        {'title': 'Property Management', 'description': 'Hassle-free management for landlords and investors.'}
+    ],
+    'automotive': [
+        {'title': 'Servicing & Repairs', 'description': 'Skilled technicians keeping your vehicle on the road.'},
+        {'title': 'Diagnostics', 'description': 'Fast, accurate diagnostics using modern equipment.'},
+        {'title': 'Sales', 'description': 'Quality vehicles with transparent pricing.'}
+    ],
+    'travel': [
+        {'title': 'Tailored Trips', 'description': 'Itineraries designed around how you like to travel.'},
+        {'title': 'Group Tours', 'description': 'Guided experiences with everything taken care of.'},
+        {'title': '24/7 Assistance', 'description': 'Support wherever you are, whenever you need it.'}
+    ],
+    'entertainment': [
+        {'title': 'Live Events', 'description': 'Unforgettable shows and experiences.'},
+        {'title': 'Private Bookings', 'description': 'Entertainment tailored to your celebration.'},
+        {'title': 'Production', 'description': 'End-to-end production handled by professionals.'}
+    ],
+    'sports': [
+        {'title': 'Training Programs', 'description': 'Coaching that helps every athlete improve.'},
+        {'title': 'Facilities', 'description': 'Well-equipped spaces for practice and play.'},
+        {'title': 'Leagues & Events', 'description': 'Competitions and community events all year round.'}
+    ],
+    'fashion': [
+        {'title': 'Collections', 'description': 'Seasonal collections designed with care.'},
+        {'title': 'Styling', 'description': 'Personal styling advice to find your look.'},
+        {'title': 'Alterations', 'description': 'Expert tailoring for the perfect fit.'}
+    ],
+    'home-services': [
+        {'title': 'Repairs & Maintenance', 'description': 'Dependable help for every job around the home.'},
+        {'title': 'Garden & Landscaping', 'description': 'Outdoor spaces designed and cared for.'},
+        {'title': 'Renovations', 'description': 'Quality renovations delivered on time and on budget.'}
+    ],
+    'professional': [
+        {'title': 'Advisory', 'description': 'Practical advice from experienced {business_type} professionals.'},
+        {'title': 'Project Delivery', 'description': 'Projects delivered on schedule with clear communication.'},
+        {'title': 'Ongoing Support', 'description': 'A long-term partner as your needs evolve.'}
+    ],
+    'manufacturing': [
+        {'title': 'Production', 'description': 'Efficient, high-quality production at scale.'},
+        {'title': 'Custom Fabrication', 'description': 'Parts and products built to your specification.'},
+        {'title': 'Quality Assurance', 'description': 'Rigorous testing at every stage of production.'}
+    ]
+}
+
+def normalise_industry(industry):
+    return '-'.join(str(industry or '').lower().split())
+
+def _build_library():
+    library={}
+    for variant, sections in SECTION_VARIANTS.items():
+        for industry, services in list(INDUSTRY_SERVICES.items()) + [(None, DEFAULT_SERVICES)]:
+            library[(variant, industry)]={
+                'hero': sections['hero'],
+                'about': sections['about'],
+                'services': services,
+                'contact': sections['contact']
+            }
+    return library
+
+# Every (variant, industry) skeleton is assembled once at import
+FALLBACK_LIBRARY=_build_library()
+
+def _fill(value, fields):
+    if isinstance(value, str):
+        return value.format_map(fields)
+    if isinstance(value, dict):
+        return {key: _fill(item, fields) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, fields) for item in value]
+    return copy.copy(value)
+
+def get_fallback_content(business_type, industry, company_name=None, variant='default'):
+    """Ready-made website content for when the model is unavailable or fails."""
+    skeleton=(FALLBACK_LIBRARY.get((variant, normalise_industry(industry)))
+              or FALLBACK_LIBRARY[(variant, None)])
+    fields={
+        'company': company_name or 'Your Company',
+        'business_type': business_type,
+        'industry': industry
+    }
+    return _fill(skeleton, fields)
@@ -1,91 +1,217 @@
-import google.generativeai as genai
+import logging
 from flask import current_app
+from app.services.generation_cache import generation_cache, GenerationCache
+from app.services.section_stream import SectionStreamParser
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpen, CallTimeout
+from app.services.fallback_content import get_fallback_content
+from app.services.content_parser import (
+    ContentParseError, SECTIONS, describe_sections, parse_website_content)
+from app.metrics import observe_gemini
 import json
+import threading
+import time
+
+logger=logging.getLogger(__name__)
+
+# Bump whenever the prompt changes so cached generations from the old prompt are not reused
+PROMPT_VERSION=1
 
 class GeminiService:
-    def __init__(self):
-        genai.configure(api_key=current_app.config['GEMINI_API_KEY'])
-        self.model=genai.GenerativeModel('gemini-pro')
+    def __init__(self, config=None):
+        # Imported here so workers and CLI commands that never generate content skip the SDK
+        import google.generativeai as genai
+        config=config or current_app.config
+        genai.configure(api_key=config['GEMINI_API_KEY'])
+        self.model=genai.GenerativeModel(config.get('GEMINI_MODEL', 'gemini-pro'))
+        self.breaker=create_breaker(config)
     
-    def generate_website_content(self, business_type, industry, company_name=None):
+    def generate_website_content(self, business_type, industry, company_name=None, use_cache=True,
+                                fallback_variant='default'):
         try:
-            prompt=f"""
-            Create a professional website content structure for a {business_type} business in the {industry} industry.
-            Company name: {company_name or 'Your Company'}
-            
-            Please generate content in JSON format with the following structure:
-            {{
-                "hero": {{
-                    "title": "Main headline",
-                    "subtitle": "Supporting text",
-                    "cta_text": "Call to action button text"}},
-                "about": {{
-                    "title": "About section title",
-                    "content": "About section content (2-3 paragraphs)"}},
-                "services": [
-                    {{
-                        "title": "Service 1",
-                        "description": "Service description"}},
-                    {{
-                        "title": "Service 2", 
-                        "description": "Service description"}},
-                    {{
-                        "title": "Service 3",
-                        "description": "Service description"}}
-                ],
-                "contact": {{
-                    "title": "Contact section title",
-                    "content": "Contact section content"}}}}
-            
-            Make it professional and specific to the {business_type} in {industry} industry.
-            Return only valid JSON without any markdown formatting.
-            """
-            
-            response=self.model.generate_content(prompt)
-
-            content=response.text.strip()
-            if content.startswith('```json'):
-                content=content[7:]
-            if content.endswith('```'):
-                content=content[:-3]
-            if isinstance(content, str):
-                website_data=json.loads(content)
-
-            return website_data
-            
+            content, _=self.generate_with_fallbacks(business_type, industry, company_name, use_cache)
+            return content
         except Exception as e:
-            print(f"Gemini API Error: {str(e)}")
-            return self.get_fallback_content(business_type, industry, company_name)
+            logger.warning("Gemini API error: %s", e)
+            return self.get_fallback_content(business_type, industry, company_name, fallback_variant)
+    
+    def generate_with_fallbacks(self, business_type, industry, company_name=None, use_cache=True):
+        """Return (content, names of sections filled from fallback); raises when the model fails outright."""
+        if not use_cache:
+            return self._generate(business_type, industry, company_name)
+        key=GenerationCache.make_key(PROMPT_VERSION, business_type, industry, company_name or 'Your Company')
+        return generation_cache.get_or_compute(
+            key, lambda: self._generate(business_type, industry, company_name))
+    
+    def stream_website_sections(self, business_type, industry, company_name=None):
+        """Yield (section, value) pairs as each section of the generated JSON completes."""
+        parser=SectionStreamParser()
+        try:
+            for text in self._stream(business_type, industry, company_name):
+                for event in parser.feed(text):
+                    yield event
+                if parser.finished:
+                    return
+        finally:
+            if parser.invalid:
+                logger.warning("Dropped streamed sections that failed validation: %s", ', '.join(parser.invalid))
     
-    def get_fallback_content(self, business_type, industry, company_name=None):
-        company=company_name or "Your Company"
+    def _stream(self, business_type, industry, company_name=None):
+        prompt=self.build_prompt(business_type, industry, company_name)
+        start=time.perf_counter()
+        outcome='success'
+        try:
+            for chunk in self.breaker.stream(self.model.generate_content, prompt, stream=True):
+                yield chunk.text
+        except Exception as e:
+            outcome=call_outcome(e)
+            raise
+        finally:
+            observe_gemini('stream', outcome, time.perf_counter() - start)
+    
+    def _generate(self, business_type, industry, company_name=None):
+        prompt=self.build_prompt(business_type, industry, company_name)
+        response=self._call('generate', prompt)
+
+        website_data, missing=parse_website_content(response.text)
+        if not website_data:
+            raise ContentParseError('Model output has no usable sections')
+        if missing:
+            # Keep the sections we got and only ask again for the rest
+            website_data.update(self._reask(missing, business_type, industry, company_name))
+            missing=[section for section in SECTIONS if section not in website_data]
+        if missing:
+            logger.warning("Using fallback content for %s", ', '.join(missing))
+            fallback=self.get_fallback_content(business_type, industry, company_name)
+            for section in missing:
+                website_data[section]=fallback[section]
+
+        return {section: website_data[section] for section in SECTIONS}, missing
+
+    def _reask(self, sections, business_type, industry, company_name=None):
+        prompt=self.build_section_prompt(sections, business_type, industry, company_name)
+        try:
+            response=self._call('reask', prompt)
+            website_data, _=parse_website_content(response.text)
+        except Exception as e:
+            logger.warning("Gemini re-ask failed for %s: %s", ', '.join(sections), e)
+            return {}
+        return {section: website_data[section] for section in sections if section in website_data}
+
+    def _call(self, kind, prompt):
+        start=time.perf_counter()
+        outcome='success'
+        try:
+            return self.breaker.call(self.model.generate_content, prompt)
+        except Exception as e:
+            outcome=call_outcome(e)
+            raise
+        finally:
+            observe_gemini(kind, outcome, time.perf_counter() - start)
+
+    def build_prompt(self, business_type, industry, company_name=None):
+        return f"""
+        Create a professional website content structure for a {business_type} business in the {industry} industry.
+        Company name: {company_name or 'Your Company'}
         
-        return {
-            "hero": {
-                "title": f"Welcome to {company}",
-                "subtitle": f"Your trusted partner in {industry}",
-                "cta_text": "Get Started"
-            },
-            "about": {
-                "title": "About Us",
-                "content": f"We are a leading {business_type} company specializing in {industry}. With years of experience and dedication to excellence, we provide top-quality services to our clients. Our team is committed to delivering innovative solutions that meet your specific needs."
-            },
+        Please generate content in JSON format with the following structure:
+        {{
+            "hero": {{
+                "title": "Main headline",
+                "subtitle": "Supporting text",
+                "cta_text": "Call to action button text"}},
+            "about": {{
+                "title": "About section title",
+                "content": "About section content (2-3 paragraphs)"}},
             "services": [
-                {
-                    "title": "Professional Consulting",
-                    "description": f"Expert consulting services tailored to {industry} businesses."
-                },
-                {
-                    "title": "Custom Solutions",
-                    "description": "Customized solutions designed to meet your unique requirements."
-                },
-                {
-                    "title": "Support & Maintenance",
-                    "description": "Ongoing support and maintenance to ensure optimal performance."
-                }
+                {{
+                    "title": "Service 1",
+                    "description": "Service description"}},
+                {{
+                    "title": "Service 2", 
+                    "description": "Service description"}},
+                {{
+                    "title": "Service 3",
+                    "description": "Service description"}}
             ],
-            "contact": {
-                "title": "Get In Touch",
-                "content": "Ready to take your business to the next level? Contact us today to discuss how we can help you achieve your goals."
-            }
-        }
\ No newline at end of file
+            "contact": {{
+                "title": "Contact section title",
+                "content": "Contact section content"}}}}
+        
+        Make it professional and specific to the {business_type} in {industry} industry.
+        Return only valid JSON without any markdown formatting.
+        """
+
+    def build_section_prompt(self, sections, business_type, industry, company_name=None):
+        return f"""
+        Create website content for a {business_type} business in the {industry} industry.
+        Company name: {company_name or 'Your Company'}
+
+        Generate only these sections in JSON format with the following structure:
+        {describe_sections(sections)}
+
+        Make it professional and specific to the {business_type} in {industry} industry.
+        Return only valid JSON without any markdown formatting.
+        """
+
+    def get_fallback_content(self, business_type, industry, company_name=None, variant='default'):
+        return get_fallback_content(business_type, industry, company_name, variant)
+
+class StubGeminiService(GeminiService):
+    """Local stand-in for the model: canned content after a fixed delay, no network."""
+
+    def __init__(self, latency=0.0, config=None):
+        self.latency=latency
+        self.model=None
+        self.breaker=create_breaker(config or {})
+    
+    def _generate(self, business_type, industry, company_name=None):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.get_fallback_content(business_type, industry, company_name), []
+    
+    def _stream(self, business_type, industry, company_name=None):
+        text=json.dumps(self.get_fallback_content(business_type, industry, company_name))
+        chunk_size=max(1, len(text) // 8)
+        for start in range(0, len(text), chunk_size):
+            if self.latency:
+                time.sleep(self.latency / 8)
+            yield text[start:start + chunk_size]
+
+_service_lock=threading.Lock()
+
+def call_outcome(error):
+    if isinstance(error, CircuitOpen):
+        return 'circuit_open'
+    if isinstance(error, CallTimeout):
+        return 'timeout'
+    return 'error'
+
+def create_breaker(config):
+    return CircuitBreaker(
+        failure_threshold=config.get('GEMINI_BREAKER_FAILURES', 5),
+        reset_timeout=config.get('GEMINI_BREAKER_RESET', 30),
+        call_timeout=config.get('GEMINI_CALL_TIMEOUT', 20))
+
+def create_gemini_service(config):
+    if config.get('GEMINI_SERVICE') == 'stub':
+        return StubGeminiService(latency=config.get('GEMINI_STUB_LATENCY', 0.0), config=config)
+    return GeminiService(config)
+
+def get_gemini_service(app=None):
+    """Return the app's shared GeminiService, creating it on first use."""
+    app=app or current_app._get_current_object()
+    service=app.extensions.get('gemini_service')
+    if service is None:
+        with _service_lock:
+            service=app.extensions.get('gemini_service')
+            if service is None:
+                service=create_gemini_service(app.config)
+                app.extensions['gemini_service']=service
+    return service
+
+def init_app(app):
+    if app.config.get('GEMINI_WARMUP'):
+        try:
+            get_gemini_service(app)
+        except Exception as e:
+            logger.warning("Gemini warm-up failed: %s", e)
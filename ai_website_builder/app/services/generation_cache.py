@@ -0,0 +1,128 @@
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import PyMongoError
+from app import mongo
+
+logger=logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """Two-tier cache of generated website content with in-flight coalescing.
+
+    Lookups hit a per-process LRU first, then the generation_cache collection
+    (expired by a TTL index); LRU entries expire at the same time as their
+    document. Concurrent misses for the same key share the
+    result of a single upstream call. Content that needed fallback sections
+    is returned to those callers but never stored.
+    """
+
+    COLLECTION = 'generation_cache'
+    INDEXES = [
+        {'keys': [('expires_at', 1)], 'expireAfterSeconds': 0},
+    ]
+    QUERY_PLANS = [
+        ('load', {'_id': 'key'}, None),
+    ]
+
+    def __init__(self, max_entries=512, ttl=7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('GENERATION_CACHE_SIZE', self.max_entries)
+        self.ttl = app.config.get('GENERATION_CACHE_TTL', self.ttl)
+
+    @staticmethod
+    def make_key(prompt_version, *inputs):
+        normalised = [' '.join(str(value or '').lower().split()) for value in inputs]
+        payload = json.dumps([prompt_version] + normalised)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, key, compute):
+        """Return (content, fallback_sections); compute returns the same pair on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry[1]), []
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            content, expires_at = self._load(key)
+            fallback_sections = []
+            if content is None:
+                content, fallback_sections = compute()
+                if not fallback_sections:
+                    expires_at = self._store(key, content)
+            if not fallback_sections:
+                self._remember(key, content, expires_at)
+            result = (content, list(fallback_sections))
+            future.set_result(result)
+            return copy.deepcopy(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _remember(self, key, content, expires_at):
+        # Entries expire with their MongoDB document, converted to the monotonic clock
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + remaining, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key):
+        """Return (content, expires_at), or (None, None) on a miss."""
+        try:
+            cached = mongo.db.generation_cache.find_one(
+                {'_id': key, 'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        except PyMongoError as e:
+            logger.warning("Generation cache read failed: %s", e)
+            return None, None
+        if not cached:
+            return None, None
+        # PyMongo returns naive datetimes that are always UTC
+        return cached['content'], cached['expires_at'].replace(tzinfo=timezone.utc)
+
+    def _store(self, key, content):
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl)
+        try:
+            mongo.db.generation_cache.replace_one(
+                {'_id': key},
+                {'content': content, 'created_at': now, 'expires_at': expires_at},
+                upsert=True)
+        except PyMongoError as e:
+            logger.warning("Generation cache write failed: %s", e)
+        return expires_at
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+generation_cache = GenerationCache()
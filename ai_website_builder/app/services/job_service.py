@@ -0,0 +1,170 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from app.models.generation_job import GenerationJob
+from app.models.website import Website
+from app.services.gemini_service import get_gemini_service
+from app.services.fallback_content import get_fallback_content
+
+logger=logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobService:
+    """Runs website generation jobs on a bounded worker pool.
+
+    Job state lives in the generation_jobs collection, so status survives a
+    restart and jobs abandoned by a dead worker are picked up again by the
+    recovery sweep once their lease runs out.
+    """
+
+    max_workers=4
+    max_pending=100
+    lease_seconds=300
+    recovery_interval=60
+
+    _app=None
+    _executor=None
+    _pending=0
+    _events={}
+    _recovery_started=False
+    _lock=threading.Lock()
+    _worker_id=f'{socket.gethostname()}:{os.getpid()}'
+
+    @classmethod
+    def init_app(cls, app):
+        cls._app=app
+        cls.max_workers=app.config.get('GENERATION_WORKERS', cls.max_workers)
+        cls.max_pending=app.config.get('GENERATION_QUEUE_LIMIT', cls.max_pending)
+        cls.lease_seconds=app.config.get('GENERATION_JOB_LEASE', cls.lease_seconds)
+        cls.recovery_interval=app.config.get('GENERATION_JOB_RECOVERY_INTERVAL', cls.recovery_interval)
+        if cls.recovery_interval > 0:
+            # Sweep only in processes that serve requests: a CLI command would
+            # claim abandoned jobs and exit halfway through generating them
+            app.before_request(cls._start_recovery)
+
+    @classmethod
+    def _start_recovery(cls):
+        if cls._recovery_started:
+            return
+        with cls._lock:
+            if cls._recovery_started:
+                return
+            cls._recovery_started=True
+        threading.Thread(target=cls._recovery_loop, args=(cls._app,),
+                        name='generation-job-recovery', daemon=True).start()
+
+    @classmethod
+    def _get_executor(cls):
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor=ThreadPoolExecutor(
+                        max_workers=cls.max_workers, thread_name_prefix='generation')
+        return cls._executor
+
+    @classmethod
+    def submit(cls, owner_id, params):
+        with cls._lock:
+            if cls._pending >= cls.max_pending:
+                raise QueueFull('Too many website generations in progress')
+        job_id=GenerationJob(owner_id, params).save()
+        cls.enqueue(job_id)
+        return job_id
+
+    @classmethod
+    def enqueue(cls, job_id):
+        with cls._lock:
+            if job_id in cls._events:
+                return
+            cls._events[job_id]=threading.Event()
+            cls._pending+=1
+        cls._get_executor().submit(cls._run, cls._app, job_id)
+
+    @classmethod
+    def _run(cls, app, job_id):
+        try:
+            with app.app_context():
+                job=GenerationJob.claim(job_id, cls._worker_id, cls.lease_seconds)
+                if job is None:
+                    return
+                try:
+                    website_id=cls.generate_website(job['owner_id'], job['params'])
+                    GenerationJob.mark_succeeded(job_id, website_id)
+                except Exception as e:
+                    logger.exception("Generation job %s failed", job_id)
+                    GenerationJob.mark_failed(job_id, str(e))
+        finally:
+            with cls._lock:
+                cls._pending-=1
+                event=cls._events.pop(job_id, None)
+            if event:
+                event.set()
+
+    @staticmethod
+    def generate_website(owner_id, params):
+        business_type=params['business_type']
+        industry=params['industry']
+        company_name=params.get('company_name', 'Your Company')
+
+        try:
+            gemini_service=get_gemini_service()
+            website_content=gemini_service.generate_website_content(
+                business_type, industry, company_name)
+        except Exception as ai_error:
+            logger.warning("AI generation failed: %s", ai_error)
+            website_content=get_fallback_content(business_type, industry, company_name)
+
+        website=Website(
+            title=f"{company_name} - {business_type}",
+            content=website_content,
+            owner_id=owner_id,
+            business_type=business_type,
+            industry=industry,
+            template_id='default')
+        return website.save()
+
+    @classmethod
+    def wait(cls, job_id, timeout):
+        """Block until the job finishes or the timeout passes, then return the job document."""
+        deadline=time.monotonic() + timeout
+        with cls._lock:
+            event=cls._events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+            return GenerationJob.find_by_id(job_id)
+
+        # Job is running in another process: poll its stored state
+        while True:
+            job=GenerationJob.find_by_id(job_id)
+            remaining=deadline - time.monotonic()
+            if job is None or job['status'] in GenerationJob.FINISHED_STATUSES or remaining <= 0:
+                return job
+            time.sleep(min(0.5, remaining))
+
+    @classmethod
+    def recover(cls):
+        queued_before=datetime.now(timezone.utc) - timedelta(seconds=cls.recovery_interval)
+        job_ids=GenerationJob.find_recoverable(queued_before)
+        for job_id in job_ids:
+            cls.enqueue(job_id)
+        return len(job_ids)
+
+    @classmethod
+    def _recovery_loop(cls, app):
+        while True:
+            try:
+                with app.app_context():
+                    recovered=cls.recover()
+                if recovered:
+                    logger.info("Requeued %d abandoned generation job(s)", recovered)
+            except Exception as e:
+                logger.exception("Generation job recovery failed")
+            time.sleep(cls.recovery_interval)
@@ -0,0 +1,53 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class PreviewCache:
+    """Bounded LRU cache of rendered preview HTML keyed on (website_id, version)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('PREVIEW_CACHE_SIZE', self.max_entries)
+
+    @staticmethod
+    def make_key(website_data):
+        return (str(website_data['_id']), str(website_data.get('updated_at')))
+
+    @staticmethod
+    def make_etag(key):
+        return hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, website_id):
+        website_id = str(website_id)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == website_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+preview_cache = PreviewCache()
@@ -0,0 +1,75 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class PrincipalCache:
+    """TTL-bounded cache of resolved principals (user document plus role) by user_id."""
+
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('PRINCIPAL_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('PRINCIPAL_CACHE_SIZE', self.max_entries)
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                principal = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+        # Handlers treat request.current_user as their own, so never hand out
+        # the cached object itself.
+        return copy.deepcopy(principal)
+
+    def set(self, user_id, principal):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[str(user_id)] = (time.monotonic() + self.ttl, copy.deepcopy(principal))
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def invalidate_role(self, role_id):
+        role_id = str(role_id)
+        with self._lock:
+            stale = [user_id for user_id, (_, principal) in self._entries.items()
+                    if str(principal.get('role_id')) == role_id]
+            for user_id in stale:
+                del self._entries[user_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'ttl': self.ttl,
+                'max_entries': self.max_entries
+            }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,69 @@
+import math
+import re
+from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from app import mongo
+
+
+class RateLimiter:
+    """Token buckets stored in Mongo so every worker process shares them.
+
+    Each bucket is refilled and debited in a single pipeline update evaluated
+    against the server clock ($$NOW), so concurrent workers never race and
+    their local clocks do not matter.
+    """
+
+    COLLECTION = 'rate_limits'
+    INDEXES = [
+        # Buckets untouched for a day are full again; let Mongo drop them
+        {'keys': [('updated_at', 1)], 'expireAfterSeconds': 24 * 3600},
+    ]
+    QUERY_PLANS = [
+        ('consume', {'_id': 'generation:global'}, None),
+    ]
+
+    @staticmethod
+    def consume(key, capacity, refill_rate, cost=1):
+        """Take cost tokens from the bucket; returns (allowed, tokens_left, retry_after_seconds)."""
+        elapsed_seconds = {'$divide': [
+            {'$subtract': ['$$NOW', {'$ifNull': ['$updated_at', '$$NOW']}]}, 1000]}
+        pipeline = [
+            {'$set': {
+                'tokens': {'$min': [capacity, {'$add': [
+                    {'$ifNull': ['$tokens', capacity]},
+                    {'$multiply': [elapsed_seconds, refill_rate]}]}]},
+                'capacity': capacity,
+                'refill_rate': refill_rate,
+                'updated_at': '$$NOW'}},
+            {'$set': {'allowed': {'$gte': ['$tokens', cost]}}},
+            {'$set': {'tokens': {'$cond': ['$allowed', {'$subtract': ['$tokens', cost]}, '$tokens']}}},
+        ]
+        bucket = mongo.db.rate_limits.find_one_and_update(
+            {'_id': key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER)
+
+        if bucket['allowed']:
+            return True, bucket['tokens'], 0
+        retry_after = math.ceil((cost - bucket['tokens']) / refill_rate) if refill_rate > 0 else 3600
+        return False, bucket['tokens'], max(1, retry_after)
+
+    @staticmethod
+    def refund(key, cost=1):
+        return mongo.db.rate_limits.update_one(
+            {'_id': key},
+            [{'$set': {'tokens': {'$min': ['$capacity', {'$add': ['$tokens', cost]}]}}}])
+
+    @staticmethod
+    def get_buckets(prefix=None):
+        """Current state of every bucket, with tokens refilled up to now."""
+        query = {'_id': {'$regex': f'^{re.escape(prefix)}'}} if prefix else {}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        buckets = []
+        for bucket in mongo.db.rate_limits.find(query):
+            elapsed = max(0.0, (now - bucket['updated_at']).total_seconds())
+            buckets.append({
+                'key': bucket['_id'],
+                'tokens': min(bucket['capacity'], bucket['tokens'] + elapsed * bucket['refill_rate']),
+                'capacity': bucket['capacity'],
+                'refill_rate': bucket['refill_rate'],
+                'updated_at': bucket['updated_at']})
+        return buckets
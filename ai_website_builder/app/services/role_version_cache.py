@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+class RoleVersionCache:
+    """Per-process view of every role's version counter, refreshed with one query.
+
+    Stateless tokens carry the version of the role they were issued under;
+    comparing it against this map lets require_auth reject tokens minted
+    before a Role.update_role without a per-request database lookup.
+    """
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._versions = {}
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('ROLE_VERSION_CACHE_TTL', self.ttl)
+
+    def get(self, role_id):
+        with self._lock:
+            role_id = str(role_id)
+            if time.monotonic() >= self._expires_at or role_id not in self._versions:
+                from app.models.role import Role
+                self._versions = Role.get_versions()
+                self._expires_at = time.monotonic() + self.ttl
+            return self._versions.get(role_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0
+
+
+role_version_cache = RoleVersionCache()
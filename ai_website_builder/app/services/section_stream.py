@@ -0,0 +1,117 @@
+import json
+from app.services.content_parser import VALIDATORS
+
+
+class SectionStreamParser:
+    """Incrementally scans streamed model output for completed website sections.
+
+    Feed it text chunks as they arrive; it returns ('hero' | 'about' |
+    'contact', value) once that member of the top-level object is closed,
+    and ('service', value) for each element of the services array as soon
+    as that element is closed. Anything before the first '{' (such as a
+    markdown fence) is ignored. Values are checked against the same schema as
+    non-streamed output; ones that fail are dropped and their names kept in
+    ``invalid``.
+    """
+
+    OBJECT_SECTIONS=('hero', 'about', 'contact')
+
+    def __init__(self):
+        self.buffer=''
+        self.position=0
+        self.started=False
+        self.finished=False
+        self.depth=0
+        self.in_string=False
+        self.escaped=False
+        self.expect_key=False
+        self.string_start=None
+        self.key=None
+        self.value_start=None
+        self.item_start=None
+        self.invalid=[]
+
+    def feed(self, text):
+        if self.finished:
+            return []
+        if not self.started:
+            brace=text.find('{')
+            if brace == -1:
+                return []
+            text=text[brace:]
+            self.started=True
+        self.buffer+=text
+
+        events=[]
+        buffer=self.buffer
+        for i in range(self.position, len(buffer)):
+            c=buffer[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped=False
+                elif c == '\\':
+                    self.escaped=True
+                elif c == '"':
+                    self.in_string=False
+                    if self.depth == 1 and self.expect_key:
+                        self.key=json.loads(buffer[self.string_start:i + 1])
+                        self.expect_key=False
+                continue
+
+            if c == '"':
+                self.in_string=True
+                self.string_start=i
+                if self.depth == 1 and not self.expect_key and self.value_start is None:
+                    self.value_start=i
+            elif c in '{[':
+                if self.depth == 0:
+                    self.expect_key=True
+                elif self.depth == 1 and self.value_start is None:
+                    self.value_start=i
+                elif self.depth == 2 and self.key == 'services' and c == '{':
+                    self.item_start=i
+                self.depth+=1
+            elif c in '}]':
+                self.depth-=1
+                if self.depth == 2 and self.key == 'services' and self.item_start is not None:
+                    self._emit(events, 'service', buffer[self.item_start:i + 1])
+                    self.item_start=None
+                elif self.depth == 1 and self.key in self.OBJECT_SECTIONS:
+                    self._emit(events, self.key, buffer[self.value_start:i + 1])
+                elif self.depth == 0:
+                    self._emit_scalar(events, buffer, i)
+                    self.finished=True
+                    self.position=i + 1
+                    return events
+            elif c == ',' and self.depth == 1:
+                self._emit_scalar(events, buffer, i)
+                self.expect_key=True
+                self.key=None
+                self.value_start=None
+            elif self.depth == 1 and not self.expect_key and self.value_start is None and c not in ': \t\r\n':
+                self.value_start=i
+
+        self.position=len(buffer)
+        return events
+
+    def _emit_scalar(self, events, buffer, end):
+        # A section given as a string or number is closed by the next ',' or the final '}'
+        if (self.key in self.OBJECT_SECTIONS and self.value_start is not None
+                and buffer[self.value_start] not in '{['):
+            self._emit(events, self.key, buffer[self.value_start:end])
+
+    def _emit(self, events, section, text):
+        # A malformed section is dropped; the caller fills gaps from fallback content
+        try:
+            value=json.loads(text)
+        except ValueError:
+            value=None
+        if section == 'service':
+            items=VALIDATORS['services']([value])
+            value=items[0] if items else None
+        else:
+            value=VALIDATORS[section](value)
+        if value is None:
+            self.invalid.append(section)
+        else:
+            events.append((section, value))
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import tempfile
+import uuid
+from flask import current_app
+from app.services.template_service import TemplateService
+
+
+class StaticSiteService:
+    """Writes published sites to a content-addressed directory on local disk.
+
+    Rendered pages are stored once under ``objects/<aa>/<sha256>.html`` and
+    each published site gets a hard link at ``sites/<website_id>.html`` that
+    the preview endpoint can hand straight to ``send_file``.
+    """
+
+    # Fields whose change alters the published artifact
+    PUBLISH_FIELDS={'title', 'content', 'template_id', 'is_published'}
+
+    @staticmethod
+    def root():
+        return current_app.config['STATIC_SITES_DIR']
+
+    @staticmethod
+    def artifact_path(website_id):
+        return os.path.join(StaticSiteService.root(), 'sites', f'{website_id}.html')
+
+    @staticmethod
+    def object_path(digest):
+        return os.path.join(StaticSiteService.root(), 'objects', digest[:2], f'{digest}.html')
+
+    @staticmethod
+    def publish(website_data):
+        html=TemplateService.render_website(website_data).encode('utf-8')
+        digest=hashlib.sha256(html).hexdigest()
+
+        object_path=StaticSiteService.object_path(digest)
+        website_id=str(website_data['_id'])
+        artifact_path=StaticSiteService.artifact_path(website_id)
+        previous_digest=StaticSiteService._digest_of(artifact_path)
+        if previous_digest == digest:
+            return artifact_path
+
+        os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+        # Unique per call: threads of one process publish concurrently
+        tmp_path=f'{artifact_path}.{uuid.uuid4().hex}.tmp'
+        try:
+            StaticSiteService._link_object(object_path, html, tmp_path)
+            os.replace(tmp_path, artifact_path)
+        except BaseException:
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        if previous_digest:
+            StaticSiteService._prune_object(previous_digest)
+        return artifact_path
+
+    @staticmethod
+    def remove(website_id):
+        artifact_path=StaticSiteService.artifact_path(website_id)
+        digest=StaticSiteService._digest_of(artifact_path)
+        if digest is None:
+            return False
+        try:
+            os.unlink(artifact_path)
+        except FileNotFoundError:
+            return False
+        StaticSiteService._prune_object(digest)
+        return True
+
+    @staticmethod
+    def sync(website_id, website_data):
+        """Publish or remove the artifact so it matches the stored website."""
+        if website_data and website_data.get('is_published', False):
+            try:
+                return StaticSiteService.publish(website_data)
+            except OSError:
+                # Drop the old artifact so preview renders the stored website instead of stale HTML
+                StaticSiteService.remove(website_id)
+                raise
+        StaticSiteService.remove(website_id)
+        return None
+
+    @staticmethod
+    def rebuild_all(published_websites):
+        published_ids=set()
+        for website_data in published_websites:
+            StaticSiteService.publish(website_data)
+            published_ids.add(str(website_data['_id']))
+
+        removed=0
+        sites_dir=os.path.join(StaticSiteService.root(), 'sites')
+        if os.path.isdir(sites_dir):
+            for filename in os.listdir(sites_dir):
+                website_id, ext=os.path.splitext(filename)
+                if ext == '.html' and website_id not in published_ids:
+                    if StaticSiteService.remove(website_id):
+                        removed+=1
+        return len(published_ids), removed
+
+    @staticmethod
+    def _digest_of(path):
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _link_object(object_path, html, link_path):
+        """Hard-link the object at link_path, writing it first if missing or just pruned."""
+        for attempt in range(2):
+            if not os.path.exists(object_path):
+                StaticSiteService._write_atomic(object_path, html)
+            try:
+                os.link(object_path, link_path)
+                return
+            except FileNotFoundError:
+                # Lost a race with _prune_object removing the object
+                if attempt:
+                    raise
+
+    @staticmethod
+    def _prune_object(digest):
+        # The object is only referenced through hard links, so a link count
+        # of one means no published site points at it any more.
+        object_path=StaticSiteService.object_path(digest)
+        try:
+            if os.stat(object_path).st_nlink <= 1:
+                os.unlink(object_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write_atomic(path, data):
+        directory=os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path=tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
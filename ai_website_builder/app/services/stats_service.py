@@ -0,0 +1,41 @@
+import threading
+import time
+from app.models.user import User
+from app.models.role import Role
+from app.models.website import Website
+
+
+class StatsService:
+    """Admin dashboard counters served from a short-lived snapshot.
+
+    Totals use collection metadata counts; only the published count needs a
+    filtered count_documents, which never transfers website bodies.
+    """
+
+    ttl=30
+
+    _snapshot=None
+    _expires_at=0
+    _lock=threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls.ttl=app.config.get('DASHBOARD_STATS_TTL', cls.ttl)
+
+    @classmethod
+    def get_dashboard_statistics(cls):
+        with cls._lock:
+            if cls._snapshot is None or time.monotonic() >= cls._expires_at:
+                cls._snapshot={
+                    'total_users': User.estimated_count(),
+                    'total_websites': Website.estimated_count(),
+                    'published_websites': Website.count_published(),
+                    'total_roles': Role.estimated_count()
+                }
+                cls._expires_at=time.monotonic() + cls.ttl
+            return dict(cls._snapshot)
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._snapshot=None
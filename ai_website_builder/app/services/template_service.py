@@ -1,28 +1,10 @@
+import threading
+from jinja2 import Environment, select_autoescape
+
+
 class TemplateService:
-    @staticmethod
-    def get_available_templates():
-        return [
-            {
-                'id': 'default',
-                'name': 'Default Template',
-                'description': 'Clean and professional template'
-            },
-            {
-                'id': 'modern',
-                'name': 'Modern Template', 
-                'description': 'Contemporary design with animations'
-            },
-            {
-                'id': 'minimal',
-                'name': 'Minimal Template',
-                'description': 'Simple and elegant design'
-            }
-        ]
-    
-    @staticmethod
-    def get_template_html(template_id='default'):
-        templates={
-            'default': """
+    TEMPLATES={
+        'default': """
             <!DOCTYPE html>
             <html lang="en">
             <head>
@@ -50,14 +32,14 @@ class TemplateService:
                         <a href="#contact" class="btn">{{ hero.cta_text }}</a>
                     </div>
                 </section>
-                
+
                 <section class="section">
                     <div class="container">
                         <h2>{{ about.title }}</h2>
                         <p>{{ about.content }}</p>
                     </div>
                 </section>
-                
+
                 <section class="section">
                     <div class="container">
                         <h2>Our Services</h2>
@@ -71,7 +53,71 @@ class TemplateService:
                         </div>
                     </div>
                 </section>
-                
+
+                <section class="section contact" id="contact">
+                    <div class="container">
+                        <h2>{{ contact.title }}</h2>
+                        <p>{{ contact.content }}</p>
+                    </div>
+                </section>
+            </body>
+            </html>
+            """,
+        'modern': """
+            <!DOCTYPE html>
+            <html lang="en">
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>{{ title }}</title>
+                <style>
+                    * { box-sizing: border-box; }
+                    body { font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; margin: 0; padding: 0; line-height: 1.7; color: #1f2933; background: #0f172a; }
+                    .container { max-width: 1140px; margin: 0 auto; padding: 0 24px; }
+                    @keyframes rise { from { opacity: 0; transform: translateY(24px); } to { opacity: 1; transform: none; } }
+                    .hero { min-height: 80vh; display: flex; align-items: center; color: #f8fafc; background: radial-gradient(circle at 20% 20%, #6366f1 0%, #0f172a 60%); }
+                    .hero h1 { font-size: 3.6em; line-height: 1.1; margin: 0 0 24px; animation: rise 0.8s ease-out both; }
+                    .hero p { font-size: 1.3em; max-width: 640px; opacity: 0.85; animation: rise 0.8s 0.15s ease-out both; }
+                    .btn { display: inline-block; margin-top: 24px; padding: 14px 34px; border-radius: 999px; background: #22d3ee; color: #0f172a; font-weight: bold; text-decoration: none; transition: transform 0.2s; animation: rise 0.8s 0.3s ease-out both; }
+                    .btn:hover { transform: translateY(-3px); }
+                    .section { padding: 90px 0; background: #f8fafc; }
+                    .section h2 { font-size: 2.2em; margin-top: 0; }
+                    .services { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 28px; margin-top: 40px; }
+                    .service-card { background: white; padding: 32px; border-radius: 16px; box-shadow: 0 10px 30px rgba(15, 23, 42, 0.08); transition: transform 0.2s, box-shadow 0.2s; }
+                    .service-card:hover { transform: translateY(-6px); box-shadow: 0 20px 40px rgba(15, 23, 42, 0.12); }
+                    .contact { background: #0f172a; color: #f8fafc; text-align: center; }
+                </style>
+            </head>
+            <body>
+                <section class="hero">
+                    <div class="container">
+                        <h1>{{ hero.title }}</h1>
+                        <p>{{ hero.subtitle }}</p>
+                        <a href="#contact" class="btn">{{ hero.cta_text }}</a>
+                    </div>
+                </section>
+
+                <section class="section">
+                    <div class="container">
+                        <h2>{{ about.title }}</h2>
+                        <p>{{ about.content }}</p>
+                    </div>
+                </section>
+
+                <section class="section">
+                    <div class="container">
+                        <h2>What We Do</h2>
+                        <div class="services">
+                            {% for service in services %}
+                            <div class="service-card">
+                                <h3>{{ service.title }}</h3>
+                                <p>{{ service.description }}</p>
+                            </div>
+                            {% endfor %}
+                        </div>
+                    </div>
+                </section>
+
                 <section class="section contact" id="contact">
                     <div class="container">
                         <h2>{{ contact.title }}</h2>
@@ -80,6 +126,149 @@ class TemplateService:
                 </section>
             </body>
             </html>
+            """,
+        'minimal': """
+            <!DOCTYPE html>
+            <html lang="en">
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>{{ title }}</title>
+                <style>
+                    body { font-family: Georgia, 'Times New Roman', serif; margin: 0; padding: 0; line-height: 1.8; color: #222; background: #fff; }
+                    .container { max-width: 720px; margin: 0 auto; padding: 0 20px; }
+                    header { padding: 100px 0 60px; border-bottom: 1px solid #eee; }
+                    header h1 { font-size: 2.6em; font-weight: normal; margin: 0 0 12px; }
+                    header p { color: #666; font-size: 1.1em; margin: 0 0 24px; }
+                    .btn { color: #222; border-bottom: 1px solid #222; text-decoration: none; }
+                    section { padding: 50px 0; border-bottom: 1px solid #eee; }
+                    h2 { font-weight: normal; font-size: 1.6em; }
+                    ul { list-style: none; padding: 0; }
+                    li { margin-bottom: 24px; }
+                    li h3 { font-size: 1.1em; margin: 0 0 4px; }
+                    li p { margin: 0; color: #555; }
+                </style>
+            </head>
+            <body>
+                <header>
+                    <div class="container">
+                        <h1>{{ hero.title }}</h1>
+                        <p>{{ hero.subtitle }}</p>
+                        <a href="#contact" class="btn">{{ hero.cta_text }}</a>
+                    </div>
+                </header>
+
+                <section>
+                    <div class="container">
+                        <h2>{{ about.title }}</h2>
+                        <p>{{ about.content }}</p>
+                    </div>
+                </section>
+
+                <section>
+                    <div class="container">
+                        <h2>Services</h2>
+                        <ul>
+                            {% for service in services %}
+                            <li>
+                                <h3>{{ service.title }}</h3>
+                                <p>{{ service.description }}</p>
+                            </li>
+                            {% endfor %}
+                        </ul>
+                    </div>
+                </section>
+
+                <section id="contact">
+                    <div class="container">
+                        <h2>{{ contact.title }}</h2>
+                        <p>{{ contact.content }}</p>
+                    </div>
+                </section>
+            </body>
+            </html>
             """
+    }
+
+    DEFAULT_TEMPLATE_ID='default'
+
+    _environment=None
+    _compiled={}
+    _lock=threading.Lock()
+
+    @staticmethod
+    def get_available_templates():
+        return [
+            {
+                'id': 'default',
+                'name': 'Default Template',
+                'description': 'Clean and professional template'
+            },
+            {
+                'id': 'modern',
+                'name': 'Modern Template',
+                'description': 'Contemporary design with animations'
+            },
+            {
+                'id': 'minimal',
+                'name': 'Minimal Template',
+                'description': 'Simple and elegant design'
+            }
+        ]
+
+    @staticmethod
+    def get_template_html(template_id='default'):
+        templates=TemplateService.TEMPLATES
+        return templates.get(template_id, templates[TemplateService.DEFAULT_TEMPLATE_ID])
+
+    @classmethod
+    def init_app(cls, app):
+        """Compile every site template once against the app's Jinja environment."""
+        cls.compile_all(app.jinja_env)
+
+    @classmethod
+    def compile_all(cls, environment=None):
+        with cls._lock:
+            if environment is None:
+                environment=cls._environment or Environment(autoescape=select_autoescape(default_for_string=True))
+            cls._environment=environment
+            cls._compiled={
+                template_id: environment.from_string(source)
+                for template_id, source in cls.TEMPLATES.items()}
+
+    @classmethod
+    def get_template(cls, template_id=None):
+        if not cls._compiled:
+            cls.compile_all()
+        compiled=cls._compiled
+        return compiled.get(template_id) or compiled[cls.DEFAULT_TEMPLATE_ID]
+
+    @staticmethod
+    def build_context(website_data):
+        content=website_data.get('content') or {}
+        hero=content.get('hero') or {}
+        about=content.get('about') or {}
+        contact=content.get('contact') or {}
+        return {
+            'title': website_data.get('title', 'Website'),
+            'hero': {
+                'title': hero.get('title', 'Welcome'),
+                'subtitle': hero.get('subtitle', 'Professional website'),
+                'cta_text': hero.get('cta_text', 'Get Started')},
+            'about': {
+                'title': about.get('title', 'About Us'),
+                'content': about.get('content', 'Learn more about our business.')},
+            'services': content.get('services') or [],
+            'contact': {
+                'title': contact.get('title', 'Contact Us'),
+                'content': contact.get('content', 'Get in touch with us today.')}
         }
-        return templates.get(template_id, templates['default'])
\ No newline at end of file
+
+    @classmethod
+    def render_website(cls, website_data):
+        content=website_data.get('content', {})
+        if isinstance(content, str):
+            return f"<html><body><h1>{website_data.get('title', 'Website')}</h1><div>{content}</div></body></html>"
+
+        template=cls.get_template(website_data.get('template_id'))
+        return template.render(cls.build_context(website_data))
@@ -0,0 +1,38 @@
+import threading
+import time
+
+
+class TokenVersionCache:
+    """Per-process view of the token versions bumped within one token lifetime.
+
+    Stateless tokens carry their user's version at issue; require_auth
+    rejects a token whose user has since been bumped (role change,
+    deletion) without a per-request database lookup. Users missing from the
+    map have not been bumped since any live token was issued.
+    """
+
+    def __init__(self, ttl=5, lifetime=24 * 3600):
+        self.ttl = ttl
+        self.lifetime = lifetime
+        self._versions = {}
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('ROLE_VERSION_CACHE_TTL', self.ttl)
+        self.lifetime = int(app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+
+    def is_current(self, user_id, version):
+        with self._lock:
+            if time.monotonic() >= self._expires_at:
+                from app.models.token_version import TokenVersion
+                self._versions = TokenVersion.get_versions()
+                self._expires_at = time.monotonic() + self.ttl
+            return self._versions.get(str(user_id), version) == version
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0
+
+
+token_version_cache = TokenVersionCache()
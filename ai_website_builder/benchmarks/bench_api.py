@@ -0,0 +1,314 @@
+"""Load benchmark: drive the main API endpoints concurrently and record latency and throughput.
+
+Boots create_app against a local mongod (``--mongo-uri``) or, when no URI is
+given, an in-memory mongomock database. Seeds users, roles and websites,
+replaces Gemini with the stub service, then runs each endpoint with the
+requested concurrency through Flask test clients (no network). Results are
+written as JSON so runs can be compared with ``--baseline``.
+
+Run from the ai_website_builder directory:
+
+    python -m benchmarks.bench_api [--mongo-uri mongodb://localhost:27017/ai_website_builder_bench]
+        [--users 50] [--websites 500] [--requests 200] [--concurrency 8]
+        [--output benchmarks/results/api.json] [--baseline previous.json]
+
+The database named in --mongo-uri is dropped before seeding.
+"""
+import argparse
+import inspect
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import flask_pymongo
+from config import config, DevelopmentConfig
+
+PASSWORD='benchmark-password'
+ENDPOINTS=['login', 'websites', 'preview', 'admin_users', 'generate']
+
+
+def parse_args():
+    parser=argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mongo-uri', default=os.getenv('BENCH_MONGODB_URI'),
+                        help='MongoDB URI including a scratch database name; default is in-memory mongomock')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--roles', type=int, default=5, help='custom roles seeded on top of the defaults')
+    parser.add_argument('--websites', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--stub-latency', type=float, default=0.05, help='seconds per stubbed Gemini call')
+    parser.add_argument('--bcrypt-rounds', type=int, default=None, help='override BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--static', action='store_true', help='publish static artifacts before the preview run')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--output', default=None, help='result file (default benchmarks/results/api-<timestamp>.json)')
+    parser.add_argument('--baseline', default=None, help='earlier result file to compare against')
+    parser.add_argument('--seed', type=int, default=1)
+    return parser.parse_args()
+
+
+def make_config(args, static_dir):
+    class BenchmarkConfig(DevelopmentConfig):
+        MONGO_URI=args.mongo_uri or 'mongodb://localhost:27017/ai_website_builder_bench'
+        GEMINI_SERVICE='stub'
+        GEMINI_STUB_LATENCY=args.stub_latency
+        RATE_LIMIT_ENABLED=False
+        GENERATION_QUEUE_LIMIT=max(args.requests * 2, 100)
+        STATIC_SITES_DIR=static_dir
+        LOG_LEVEL='WARNING'
+        DB_BOOTSTRAP_ON_STARTUP=False
+    if args.bcrypt_rounds is not None:
+        BenchmarkConfig.BCRYPT_LOG_ROUNDS=args.bcrypt_rounds
+    return BenchmarkConfig
+
+
+def use_mongomock(stack):
+    """Point Flask-PyMongo at an in-memory mongomock client for the rest of the run."""
+    try:
+        import mongomock
+        from mongomock.collection import BulkOperationBuilder
+    except ImportError:
+        sys.exit('No --mongo-uri given and mongomock is not installed; '
+                 'start a local mongod or pip install mongomock')
+
+    def make_client(*args, **kwargs):
+        kwargs.pop('event_listeners', None)
+        return mongomock.MongoClient(*args, **kwargs)
+    stack.enter_context(mock.patch.object(flask_pymongo, 'MongoClient', make_client))
+
+    # Newer PyMongo passes sort= to bulk updates, which mongomock does not accept yet
+    add_update=BulkOperationBuilder.add_update
+    if 'sort' not in inspect.signature(add_update).parameters:
+        def compatible_add_update(self, *args, sort=None, **kwargs):
+            return add_update(self, *args, **kwargs)
+        stack.enter_context(mock.patch.object(BulkOperationBuilder, 'add_update', compatible_add_update))
+
+
+def seed(args, mongo):
+    from app.cli import init_database
+    from app.models.role import Role
+    from app.models.website import Website
+    from app.services.credential_service import CredentialService
+
+    mongo.cx.drop_database(mongo.db.name)
+    init_database()
+    for i in range(args.roles):
+        Role(f'bench-role-{i}', 'Benchmark role', ['read_website']).save()
+
+    # One hash shared by every seeded user keeps seeding fast at any bcrypt cost
+    password_hash=CredentialService.hash_password(PASSWORD)
+    editor_id=Role.find_by_name('editor')['_id']
+    now=datetime.now(timezone.utc)
+    users=[{
+        'email': f'bench{i}@example.com',
+        'password_hash': password_hash,
+        'role_id': editor_id,
+        'is_active': True,
+        'created_at': now,
+        'updated_at': now
+    } for i in range(args.users)]
+    user_ids=mongo.db.users.insert_many(users).inserted_ids
+
+    rng=random.Random(args.seed)
+    websites=[]
+    for i in range(args.websites):
+        website=Website(
+            title=f'Bench Site {i} - restaurant',
+            content={
+                'hero': {'title': f'Bench Site {i}', 'subtitle': 'Benchmark data', 'cta_text': 'Go'},
+                'about': {'title': 'About', 'content': 'Seeded for benchmarking. ' * 10},
+                'services': [{'title': f'Service {j}', 'description': 'Seeded service.'} for j in range(3)],
+                'contact': {'title': 'Contact', 'content': 'bench@example.com'}
+            },
+            owner_id=rng.choice(user_ids),
+            business_type='restaurant',
+            industry='food-service',
+            template_id=rng.choice(['default', 'modern', 'minimal']),
+            is_published=i % 2 == 0)
+        websites.append(website)
+    Website.insert_many(websites)
+    return [str(doc['_id']) for doc in mongo.db.websites.find({'is_published': True}, {'_id': 1})]
+
+
+def login(client, email, password=PASSWORD):
+    response=client.post('/auth/login', json={'email': email, 'password': password})
+    if response.status_code != 200:
+        sys.exit(f'Login for {email} failed during setup: {response.status_code} {response.get_data(as_text=True)}')
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+def build_requests(args, app, published_ids):
+    setup_client=app.test_client()
+    admin_headers=login(setup_client, 'admin@admin.com', 'admin123')
+    editor_headers=[login(setup_client, f'bench{i}@example.com') for i in range(min(args.users, 10))]
+
+    def pick(items):
+        return items[random.randrange(len(items))]
+
+    return {
+        'login': lambda client: client.post('/auth/login', json={
+            'email': f'bench{random.randrange(args.users)}@example.com', 'password': PASSWORD}),
+        'websites': lambda client: client.get('/api/websites?limit=50', headers=pick(editor_headers)),
+        'preview': lambda client: client.get(f'/api/preview/{pick(published_ids)}'),
+        'admin_users': lambda client: client.get('/api/admin/users?limit=50', headers=admin_headers),
+        'generate': lambda client: client.post('/api/generate-website', headers=pick(editor_headers), json={
+            'business_type': 'restaurant', 'industry': 'food-service',
+            'company_name': f'Bench {random.randrange(1000)}'})
+    }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    index=max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def mongo_command_total():
+    from app.metrics import mongo_commands
+    return mongo_commands.total()
+
+
+def run_endpoint(app, send, count, concurrency, count_db_ops):
+    local=threading.local()
+    latencies=[]
+    statuses={}
+    lock=threading.Lock()
+
+    def one(_):
+        client=getattr(local, 'client', None)
+        if client is None:
+            client=local.client=app.test_client()
+        start=time.perf_counter()
+        response=send(client)
+        response.get_data()
+        elapsed=time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status_code]=statuses.get(response.status_code, 0) + 1
+
+    db_ops_before=mongo_command_total()
+    started=time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(count)))
+    wall=time.perf_counter() - started
+    db_ops=mongo_command_total() - db_ops_before
+
+    latencies.sort()
+    ms=lambda value: round(value * 1e3, 3)
+    return {
+        'requests': count,
+        'concurrency': concurrency,
+        'wall_seconds': round(wall, 3),
+        'throughput_rps': round(count / wall, 2),
+        'status_counts': {str(code): n for code, n in sorted(statuses.items())},
+        'errors': sum(n for code, n in statuses.items() if code >= 500),
+        'latency_ms': {
+            'mean': ms(sum(latencies) / len(latencies)),
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1])
+        },
+        'db_ops_per_request': round(db_ops / count, 2) if count_db_ops else None
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results, baseline=None):
+    header=f"{'endpoint':<12} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'db ops':>7} {'errors':>7}"
+    print(header)
+    for name, result in results.items():
+        latency=result['latency_ms']
+        db_ops=result['db_ops_per_request']
+        line=(f"{name:<12} {result['throughput_rps']:>9.1f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} "
+              f"{latency['p99']:>9.2f} {'-' if db_ops is None else db_ops:>7} {result['errors']:>7}")
+        previous=(baseline or {}).get(name)
+        if previous:
+            rps_change=result['throughput_rps'] / previous['throughput_rps'] - 1
+            p95_change=latency['p95'] / previous['latency_ms']['p95'] - 1
+            line+=f"   rps {rps_change:+.0%}, p95 {p95_change:+.0%} vs baseline"
+        print(line)
+
+
+def main():
+    args=parse_args()
+    endpoints=[name.strip() for name in args.endpoints.split(',') if name.strip()]
+    unknown=set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+    random.seed(args.seed)
+
+    with ExitStack() as stack:
+        static_dir=stack.enter_context(tempfile.TemporaryDirectory())
+        if not args.mongo_uri:
+            use_mongomock(stack)
+        config['benchmark']=make_config(args, static_dir)
+
+        from app import create_app, mongo
+        app=create_app('benchmark')
+
+        with app.app_context():
+            published_ids=seed(args, mongo)
+            if args.static:
+                from app.models.website import Website
+                from app.services.static_site_service import StaticSiteService
+                StaticSiteService.rebuild_all(Website.get_published_websites())
+            senders=build_requests(args, app, published_ids)
+
+        results={}
+        for name in endpoints:
+            print(f'running {name} ...', file=sys.stderr)
+            results[name]=run_endpoint(app, senders[name], args.requests, args.concurrency,
+                                       count_db_ops=bool(args.mongo_uri))
+
+    report={
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'database': 'mongod' if args.mongo_uri else 'mongomock',
+        'settings': {
+            'users': args.users, 'roles': args.roles, 'websites': args.websites,
+            'requests': args.requests, 'concurrency': args.concurrency,
+            'stub_latency': args.stub_latency, 'bcrypt_rounds': app.config['BCRYPT_LOG_ROUNDS'],
+            'static': args.static
+        },
+        'results': results
+    }
+
+    output=args.output or os.path.join(
+        os.path.dirname(__file__), 'results', f"api-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline=None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline=json.load(f)['results']
+    print_report(results, baseline)
+    if not args.mongo_uri:
+        print('db ops are only counted against a real mongod (command monitoring)', file=sys.stderr)
+    print(f'results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Micro-benchmark: listing-endpoint JSON serialisation before and after MongoJSONProvider.
+
+Every case goes through ``provider.response()``, the path ``jsonify`` takes,
+so the keyword arguments Flask passes to ``dumps`` are the real ones.
+
+Run from the ai_website_builder directory:
+
+    python -m benchmarks.bench_json [--websites 200] [--iterations 200]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from unittest import mock
+from bson.objectid import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app import json_provider
+from app.json_provider import MongoJSONProvider
+
+
+def serialize_object_id(obj):
+    """The per-module helper the API used before the JSON provider, kept here as the baseline."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, ObjectId):
+                obj[key]=str(value)
+            elif isinstance(value, dict):
+                serialize_object_id(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        serialize_object_id(item)
+    elif isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, dict):
+                serialize_object_id(item)
+    return obj
+
+
+def make_websites(count):
+    now=datetime.utcnow()
+    owner_id=ObjectId()
+    return [{
+        '_id': ObjectId(),
+        'title': f'Acme Bakery {i} - restaurant',
+        'content': {
+            'hero': {'title': 'Welcome to Acme Bakery', 'subtitle': 'Fresh bread daily', 'cta_text': 'Order Now'},
+            'about': {'title': 'About Us', 'content': 'Family owned since 1952. ' * 10},
+            'services': [
+                {'title': f'Service {j}', 'description': 'Hand-made with care. ' * 3}
+                for j in range(3)],
+            'contact': {'title': 'Visit Us', 'content': '12 Main Street'}
+        },
+        'owner_id': owner_id,
+        'business_type': 'restaurant',
+        'industry': 'food-service',
+        'template_id': 'default',
+        'is_published': i % 2 == 0,
+        'created_at': now - timedelta(days=i),
+        'updated_at': now - timedelta(hours=i)
+    } for i in range(count)]
+
+
+def measure(encode, websites, iterations):
+    # The baseline mutates its input, so every iteration gets a fresh copy made outside the timer
+    elapsed=0.0
+    peak=0
+    for _ in range(iterations):
+        payload=copy.deepcopy(websites)
+        tracemalloc.start()
+        start=time.perf_counter()
+        encode(payload)
+        elapsed+=time.perf_counter() - start
+        peak=max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed / iterations, peak
+
+
+def main():
+    parser=argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--websites', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=200)
+    args=parser.parse_args()
+
+    app=Flask(__name__)
+    default_provider=DefaultJSONProvider(app)
+    mongo_provider=MongoJSONProvider(app)
+    websites=make_websites(args.websites)
+
+    def stdlib_only(payload):
+        with mock.patch.object(json_provider, 'orjson', None):
+            return mongo_provider.response({'websites': payload})
+
+    cases=[
+        ('serialize_object_id + default', lambda payload: default_provider.response(
+            {'websites': serialize_object_id(payload)})),
+        ('MongoJSONProvider (stdlib)', stdlib_only)
+    ]
+    if json_provider.orjson is not None:
+        cases.append(('MongoJSONProvider (orjson)', lambda payload: mongo_provider.response(
+            {'websites': payload})))
+
+    print(f"{args.websites} websites per response, {args.iterations} iterations "
+          f"(tracemalloc is on while timing, so compare times relatively)")
+    print(f"{'encoder':<32} {'time/response':>14} {'peak alloc':>12}")
+    baseline=None
+    for name, encode in cases:
+        per_response, peak=measure(encode, websites, args.iterations)
+        baseline=baseline or per_response
+        print(f"{name:<32} {per_response * 1e3:>11.2f} ms {peak / 1024:>9.1f} KiB"
+              f"  ({baseline / per_response:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Startup benchmark: create_app() wall time and import cost, failing on regressions.
+
+Every measurement runs in a fresh interpreter. create_app() is timed with the
+production config, which skips the database bootstrap, and the run fails if
+any module listed in HEAVY_MODULES has been imported by the time it returns.
+
+Run from the ai_website_builder directory:
+
+    python -m benchmarks.bench_startup [--runs 5] [--save benchmarks/results/startup.json]
+        [--baseline benchmarks/results/startup.json] [--max-regression 0.25]
+        [--max-create-app-ms 1500] [--max-import-ms 1000]
+
+Exits with status 1 when a threshold is exceeded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT=os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Integrations that must only be imported on first use
+HEAVY_MODULES=['google.generativeai']
+
+CREATE_APP_SCRIPT="""
+import json, sys, time
+start=time.perf_counter()
+from app import create_app
+app=create_app('production')
+elapsed=time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def run_python(args, env=None):
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def startup_env():
+    return dict(os.environ, GEMINI_WARMUP='false', DB_BOOTSTRAP_ON_STARTUP='false')
+
+
+def measure_create_app():
+    result=run_python(['-c', CREATE_APP_SCRIPT % (HEAVY_MODULES,)], env=startup_env())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_imports():
+    """Total and per-package cumulative import time in microseconds from -X importtime."""
+    result=run_python(['-X', 'importtime', '-c', "from app import create_app; create_app('production')"],
+                      env=startup_env())
+    total=0
+    top_level={}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name=line[len('import time:'):].split('|')
+        # Top-level imports are the ones without indentation
+        if not name.startswith('  '):
+            total+=int(cumulative)
+            top_level[name.strip()]=int(cumulative)
+    slowest=dict(sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:10])
+    return total, slowest
+
+
+def check(name, value, baseline_value, max_regression, absolute_limit):
+    failures=[]
+    if absolute_limit is not None and value > absolute_limit:
+        failures.append(f'{name} {value:.1f} ms exceeds the {absolute_limit:.1f} ms limit')
+    if baseline_value and value > baseline_value * (1 + max_regression):
+        failures.append(f'{name} {value:.1f} ms is more than {max_regression:.0%} above '
+                        f'the baseline {baseline_value:.1f} ms')
+    return failures
+
+
+def main():
+    parser=argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--baseline', default=None, help='earlier --save output to compare against')
+    parser.add_argument('--save', default=None, help='write the results here as JSON')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (0.25 = 25%%)')
+    parser.add_argument('--max-create-app-ms', type=float, default=None)
+    parser.add_argument('--max-import-ms', type=float, default=None)
+    args=parser.parse_args()
+
+    create_app_runs=[]
+    import_runs=[]
+    loaded=set()
+    slowest={}
+    for _ in range(args.runs):
+        result=measure_create_app()
+        create_app_runs.append(result['seconds'] * 1e3)
+        loaded.update(result['loaded'])
+        total, slowest=measure_imports()
+        import_runs.append(total / 1e3)
+
+    report={
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'create_app_ms': round(statistics.median(create_app_runs), 2),
+        'import_ms': round(statistics.median(import_runs), 2),
+        'slowest_imports_ms': {name: round(us / 1e3, 2) for name, us in slowest.items()},
+        'heavy_modules_loaded': sorted(loaded)
+    }
+
+    print(f"create_app(): {report['create_app_ms']:.1f} ms (median of {args.runs})")
+    print(f"imports:      {report['import_ms']:.1f} ms (median of {args.runs})")
+    for name, ms in report['slowest_imports_ms'].items():
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline={}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline=json.load(f)
+
+    failures=[f'{name} was imported during create_app()' for name in report['heavy_modules_loaded']]
+    failures+=check('create_app()', report['create_app_ms'], baseline.get('create_app_ms'),
+                    args.max_regression, args.max_create_app_ms)
+    failures+=check('imports', report['import_ms'], baseline.get('import_ms'),
+                    args.max_regression, args.max_import_ms)
+    if failures:
+        for failure in failures:
+            print(f'FAIL: {failure}', file=sys.stderr)
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
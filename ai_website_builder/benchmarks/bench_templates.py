@@ -0,0 +1,58 @@
+"""Micro-benchmark: compile-once site templates versus per-request parsing.
+
+Run from the ai_website_builder directory:
+
+    python -m benchmarks.bench_templates [--iterations 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, render_template_string
+from app.services.template_service import TemplateService
+
+SAMPLE_WEBSITE={
+    '_id': 'benchmark',
+    'title': 'Acme Bakery - restaurant',
+    'template_id': 'default',
+    'content': {
+        'hero': {'title': 'Welcome to Acme Bakery', 'subtitle': 'Fresh bread daily', 'cta_text': 'Order Now'},
+        'about': {'title': 'About Us', 'content': 'Family owned since 1952. ' * 20},
+        'services': [
+            {'title': f'Service {i}', 'description': 'Hand-made with care. ' * 5}
+            for i in range(6)],
+        'contact': {'title': 'Visit Us', 'content': '12 Main Street'}
+    }
+}
+
+
+def main():
+    parser=argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args=parser.parse_args()
+
+    app=Flask(__name__)
+    TemplateService.init_app(app)
+    context=TemplateService.build_context(SAMPLE_WEBSITE)
+
+    with app.app_context():
+        print(f"{'template':<10} {'per-request parse':>20} {'compiled once':>16} {'speedup':>9}")
+        for template_id in TemplateService.TEMPLATES:
+            source=TemplateService.get_template_html(template_id)
+            compiled=TemplateService.get_template(template_id)
+
+            parse_time=timeit.timeit(
+                lambda: render_template_string(source, **context), number=args.iterations)
+            compiled_time=timeit.timeit(
+                lambda: compiled.render(context), number=args.iterations)
+
+            per_parse=parse_time / args.iterations * 1e6
+            per_compiled=compiled_time / args.iterations * 1e6
+            print(f"{template_id:<10} {per_parse:>17.1f} us {per_compiled:>13.1f} us {per_parse / per_compiled:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
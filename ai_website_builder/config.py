@@ -4,18 +4,79 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+basedir=os.path.abspath(os.path.dirname(__file__))
+
 class Config:
     SECRET_KEY=os.getenv('SECRET_KEY') or 'your-secret-key-here'
     MONGO_URI=os.getenv('MONGODB_URI') or 'mongodb://localhost:27017/ai_website_builder'
     JWT_SECRET_KEY=os.getenv('JWT_SECRET_KEY') or 'jwt-secret-key'
     JWT_ACCESS_TOKEN_EXPIRES=timedelta(hours=24)
+    # Embed role and permission bitmask in tokens so auth checks skip the database.
+    # Role edits, role reassignment and user deletion make earlier tokens stale
+    # within ROLE_VERSION_CACHE_TTL seconds; the user then has to log in again.
+    JWT_PERMISSION_CLAIMS=os.getenv('JWT_PERMISSION_CLAIMS', 'false').lower() == 'true'
+    BCRYPT_LOG_ROUNDS=int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    BCRYPT_WORKERS=int(os.getenv('BCRYPT_WORKERS', 0)) or None
+    ROLE_VERSION_CACHE_TTL=int(os.getenv('ROLE_VERSION_CACHE_TTL', 5))
     GEMINI_API_KEY=os.getenv('GEMINI_API_KEY')
+    GEMINI_MODEL=os.getenv('GEMINI_MODEL') or 'gemini-pro'
+    # 'gemini' for the real model, 'stub' for canned local content
+    GEMINI_SERVICE=os.getenv('GEMINI_SERVICE') or 'gemini'
+    GEMINI_STUB_LATENCY=float(os.getenv('GEMINI_STUB_LATENCY', 0))
+    GEMINI_CALL_TIMEOUT=float(os.getenv('GEMINI_CALL_TIMEOUT', 20))
+    GEMINI_BREAKER_FAILURES=int(os.getenv('GEMINI_BREAKER_FAILURES', 5))
+    GEMINI_BREAKER_RESET=float(os.getenv('GEMINI_BREAKER_RESET', 30))
+    GEMINI_WARMUP=os.getenv('GEMINI_WARMUP', 'false').lower() == 'true'
+    GENERATION_CACHE_SIZE=int(os.getenv('GENERATION_CACHE_SIZE', 512))
+    GENERATION_CACHE_TTL=int(os.getenv('GENERATION_CACHE_TTL', 7 * 24 * 3600))
+    GENERATION_WORKERS=int(os.getenv('GENERATION_WORKERS', 4))
+    GENERATION_QUEUE_LIMIT=int(os.getenv('GENERATION_QUEUE_LIMIT', 100))
+    GENERATION_JOB_LEASE=int(os.getenv('GENERATION_JOB_LEASE', 300))
+    GENERATION_JOB_RECOVERY_INTERVAL=int(os.getenv('GENERATION_JOB_RECOVERY_INTERVAL', 60))
+    # Cap on ?wait= long-polling for API clients; each waiting request holds a worker
+    GENERATION_JOB_MAX_WAIT=int(os.getenv('GENERATION_JOB_MAX_WAIT', 5))
+    BATCH_GENERATION_CONCURRENCY=int(os.getenv('BATCH_GENERATION_CONCURRENCY', 8))
+    BATCH_GENERATION_MAX_ITEMS=int(os.getenv('BATCH_GENERATION_MAX_ITEMS', 50))
+    RATE_LIMIT_ENABLED=os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    # Token buckets per scope: 'global' caps upstream calls across all users,
+    # role names (or 'default') cap each user holding that role
+    RATE_LIMITS={
+        'generation': {
+            'global': {'capacity': max(60, BATCH_GENERATION_MAX_ITEMS), 'per_minute': 60},
+            'admin': {'capacity': 30, 'per_minute': 30},
+            'editor': {'capacity': 10, 'per_minute': 5},
+            'default': {'capacity': 5, 'per_minute': 2},
+        },
+        # Batches debit the generation global bucket; these buckets hold one full batch
+        'batch_generation': {
+            'admin': {'capacity': BATCH_GENERATION_MAX_ITEMS, 'per_minute': 30},
+            'editor': {'capacity': BATCH_GENERATION_MAX_ITEMS, 'per_minute': 5},
+            'default': {'capacity': BATCH_GENERATION_MAX_ITEMS, 'per_minute': 2},
+        }
+    }
+    DEFAULT_PAGE_SIZE=int(os.getenv('DEFAULT_PAGE_SIZE', 50))
+    MAX_PAGE_SIZE=int(os.getenv('MAX_PAGE_SIZE', 200))
+    # Documents fetched per cursor round trip, and encoded per chunk, when streaming listings
+    STREAM_BATCH_SIZE=int(os.getenv('STREAM_BATCH_SIZE', 100))
+    DASHBOARD_STATS_TTL=int(os.getenv('DASHBOARD_STATS_TTL', 30))
+    PREVIEW_CACHE_SIZE=int(os.getenv('PREVIEW_CACHE_SIZE', 256))
+    PRINCIPAL_CACHE_TTL=int(os.getenv('PRINCIPAL_CACHE_TTL', 30))
+    PRINCIPAL_CACHE_SIZE=int(os.getenv('PRINCIPAL_CACHE_SIZE', 10000))
+    # Create indexes, default roles and the admin user in create_app; otherwise run `flask init-db`
+    DB_BOOTSTRAP_ON_STARTUP=os.getenv('DB_BOOTSTRAP_ON_STARTUP', 'false').lower() == 'true'
+    # Logs go through a queue to a background thread; LOG_FORMAT is 'text' or 'json'
+    LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT=os.getenv('LOG_FORMAT', 'text')
+    STATIC_SITES_DIR=os.getenv('STATIC_SITES_DIR') or os.path.join(basedir, 'published_sites')
     
 class DevelopmentConfig(Config):
     DEBUG=True
+    LOG_LEVEL=os.getenv('LOG_LEVEL', 'DEBUG')
+    DB_BOOTSTRAP_ON_STARTUP=os.getenv('DB_BOOTSTRAP_ON_STARTUP', 'true').lower() == 'true'
 
 class ProductionConfig(Config):
     DEBUG=False
+    LOG_FORMAT=os.getenv('LOG_FORMAT', 'json')
 
 config={
     'development': DevelopmentConfig,
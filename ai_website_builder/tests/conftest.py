@@ -0,0 +1,71 @@
+import inspect
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+mongomock=pytest.importorskip('mongomock')
+
+import flask_pymongo
+from mongomock.collection import BulkOperationBuilder
+import config as app_config
+
+
+class TestConfig(app_config.DevelopmentConfig):
+    TESTING=True
+    MONGO_URI='mongodb://localhost:27017/ai_website_builder_test'
+    GEMINI_SERVICE='stub'
+    RATE_LIMIT_ENABLED=False
+    BCRYPT_LOG_ROUNDS=4
+    DB_BOOTSTRAP_ON_STARTUP=False
+    GENERATION_JOB_RECOVERY_INTERVAL=0
+    LOG_LEVEL='WARNING'
+
+
+def make_client(*args, **kwargs):
+    kwargs.pop('event_listeners', None)
+    return mongomock.MongoClient(*args, **kwargs)
+
+
+@pytest.fixture
+def app(tmp_path):
+    patches=[
+        mock.patch.object(flask_pymongo, 'MongoClient', make_client),
+        mock.patch.dict(app_config.config, {'testing': TestConfig}),
+        mock.patch.object(TestConfig, 'STATIC_SITES_DIR', str(tmp_path)),
+    ]
+    # Newer PyMongo passes sort= to bulk updates, which mongomock does not accept yet
+    add_update=BulkOperationBuilder.add_update
+    if 'sort' not in inspect.signature(add_update).parameters:
+        def compatible_add_update(self, *args, sort=None, **kwargs):
+            return add_update(self, *args, **kwargs)
+        patches.append(mock.patch.object(BulkOperationBuilder, 'add_update', compatible_add_update))
+
+    for patch in patches:
+        patch.start()
+    try:
+        from app import create_app, mongo
+        from app.cli import init_database
+        app=create_app('testing')
+        with app.app_context():
+            mongo.cx.drop_database(mongo.db.name)
+            init_database()
+        yield app
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers(client):
+    response=client.post('/auth/login', json={'email': 'admin@admin.com', 'password': 'admin123'})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
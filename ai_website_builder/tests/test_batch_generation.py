@@ -0,0 +1,45 @@
+from unittest import mock
+
+from app.services.content_parser import SECTIONS
+
+
+class FailingService:
+    """Gemini service whose every generation fails upstream."""
+
+    def generate_with_fallbacks(self, business_type, industry, company_name=None, use_cache=True):
+        raise RuntimeError('upstream unavailable')
+
+
+def post_batch(client, headers, websites):
+    return client.post('/api/generate-websites/batch', headers=headers, json={'websites': websites})
+
+
+def test_all_invalid_items_is_a_bad_request(client, admin_headers):
+    response=post_batch(client, admin_headers, [{'industry': 'food-service'}, {'business_type': 'bakery'}])
+
+    assert response.status_code == 400
+    assert [item['status'] for item in response.get_json()['results']] == ['invalid', 'invalid']
+
+
+def test_upstream_failure_saves_fallback_content_as_degraded(app, client, admin_headers):
+    app.extensions['gemini_service']=FailingService()
+
+    response=post_batch(client, admin_headers, [{'business_type': 'bakery', 'industry': 'food-service'}])
+
+    assert response.status_code == 201
+    [item]=response.get_json()['results']
+    assert item['status'] == 'degraded'
+    assert item['fallback_sections'] == SECTIONS
+    assert item['website_id']
+
+
+def test_nothing_created_from_valid_items_is_a_server_error(app, client, admin_headers):
+    app.extensions['gemini_service']=FailingService()
+
+    with mock.patch('app.api.ai_generator.get_fallback_content', side_effect=RuntimeError('no fallback')):
+        response=post_batch(client, admin_headers, [
+            {'business_type': 'bakery', 'industry': 'food-service'},
+            {'industry': 'food-service'}])
+
+    assert response.status_code == 503
+    assert [item['status'] for item in response.get_json()['results']] == ['failed', 'invalid']
@@ -0,0 +1,58 @@
+import json
+
+from app.services.gemini_service import StubGeminiService
+from app.services.section_stream import SectionStreamParser
+
+MALFORMED_OUTPUT=json.dumps({
+    'hero': {'title': 't'},
+    'about': {'title': 'About', 'content': 'Family owned.'},
+    'services': [{'title': 'Bread'}, {'title': 'Cakes', 'description': 'Made to order.'}],
+    'contact': 'call us'
+})
+
+
+def feed_in_chunks(parser, text, size=7):
+    events=[]
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+def test_sections_failing_the_schema_are_dropped():
+    parser=SectionStreamParser()
+
+    events=feed_in_chunks(parser, MALFORMED_OUTPUT)
+
+    assert events == [
+        ('about', {'title': 'About', 'content': 'Family owned.'}),
+        ('service', {'title': 'Cakes', 'description': 'Made to order.'}),
+    ]
+    assert parser.invalid == ['hero', 'service', 'contact']
+
+
+class MalformedStreamService(StubGeminiService):
+    def _stream(self, business_type, industry, company_name=None):
+        yield MALFORMED_OUTPUT
+
+
+def parse_sse(body):
+    events=[]
+    for block in body.strip().split('\n\n'):
+        event, data=block.split('\n', 1)
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_stream_replaces_invalid_sections_with_fallback(app, client, admin_headers):
+    app.extensions['gemini_service']=MalformedStreamService()
+
+    response=client.post('/api/generate-website/stream', headers=admin_headers,
+                         json={'business_type': 'bakery', 'industry': 'food-service'})
+    events=parse_sse(response.get_data(as_text=True))
+
+    event, done=events[-1]
+    assert event == 'done'
+    assert done['fallback_sections'] == ['hero', 'contact']
+    assert done['content']['about'] == {'title': 'About', 'content': 'Family owned.'}
+    assert done['content']['services'] == [{'title': 'Cakes', 'description': 'Made to order.'}]
+    assert set(done['content']['hero']) == {'title', 'subtitle', 'cta_text'}